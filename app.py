@@ -4,18 +4,33 @@ Web interface and API for the Kurzgesagt Retrieval-Augmented Generation chatbot.
 """
 
 import os
+import functools
+import hashlib
 import uuid
+import secrets
+import atexit
 import logging
+import logging.handlers
 import io
+import inspect
+import queue
 import base64
 import re
-import types
-from tempfile import NamedTemporaryFile
-from flask import Flask, request, jsonify, session, render_template, send_file
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from flask import Flask, Response, request, jsonify, g, render_template
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
+import msgspec
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pydub import AudioSegment
 from src.kurzgesagt_rag_agent import KurzgesagtRAGAgent
+from src.redis_client import get_redis_client
+from src.tts_cache import TTSCache, make_tts_key
 
 # ElevenLabs imports with error handling
 try:
@@ -27,13 +42,41 @@ except ImportError:
     voices = None
     ELEVENLABS_CLIENT_AVAILABLE = False
 
+# Faster JSON serialization when orjson is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response compression when flask-compress is installed
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: request threads only enqueue records, and a
+# background listener thread writes them to stderr
+LOG_QUEUE = queue.SimpleQueue()
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(LOG_QUEUE))
 logger = logging.getLogger(__name__)
 
+def start_log_listener():
+    """Start the background thread that writes queued log records."""
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = logging.handlers.QueueListener(
+        LOG_QUEUE, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+start_log_listener()
+
 # ElevenLabs configuration
 try:
     ELEVENLABS_AVAILABLE = True
@@ -44,29 +87,177 @@ except ImportError:
                          "install with: pip install elevenlabs")
 
 ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
+
+# Shared ElevenLabs clients so TTS requests reuse pooled keep-alive connections
+# instead of opening a new TLS connection each time
+ELEVENLABS_CLIENT = (ElevenLabs(api_key=ELEVENLABS_API_KEY)
+                     if ELEVENLABS_CLIENT_AVAILABLE else None)
+ELEVENLABS_SESSION = requests.Session()
+ELEVENLABS_SESSION.headers.update({"Content-Type": "application/json"})
+if ELEVENLABS_API_KEY:
+    ELEVENLABS_SESSION.headers.update({"xi-api-key": ELEVENLABS_API_KEY})
+# Rate limits and transient gateway errors are retried with a short backoff
+# (POST included: synthesizing the same text twice is harmless)
+ELEVENLABS_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2,
+                      status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset({"GET", "POST"}),
+                      raise_on_status=False)
+))
+# (connect, read) timeouts for ElevenLabs REST calls
+ELEVENLABS_TIMEOUT = (3.05, 30)
 # Default Bella voice
 ELEVENLABS_VOICE_ID = os.getenv('ELEVENLABS_VOICE_ID', 'EXAVITQu4vr4xnSDxMaL')
 # Custom Rick voice ID
 RICK_VOICE_ID = os.getenv('RICK_VOICE_ID', ELEVENLABS_VOICE_ID)
 # Custom Kurzgesagt voice ID
 KURZGESAGT_VOICE_ID = os.getenv('KURZGESAGT_VOICE_ID', ELEVENLABS_VOICE_ID)
+# Flash v2.5 is the low-latency multilingual model (~75 ms to first byte)
+ELEVENLABS_MODEL_ID = os.getenv('ELEVENLABS_MODEL_ID', 'eleven_flash_v2_5')
+# Models with a built-in text normalizer (numbers, abbreviations, symbols)
+NORMALIZING_MODELS = frozenset({'eleven_turbo_v2_5', 'eleven_flash_v2_5'})
+# 22.05 kHz / 32 kbps MP3 is plenty for speech and a quarter of the default size
+TTS_OUTPUT_FORMAT = os.getenv('ELEVENLABS_OUTPUT_FORMAT', 'mp3_22050_32')
+
+# Synthesized audio cache (byte budget, default 100 MB), shared via Redis when configured
+TTS_CACHE = TTSCache(
+    max_bytes=int(os.getenv('TTS_CACHE_MAX_BYTES', str(100 * 1024 * 1024))),
+    redis_client=get_redis_client()
+)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for jsonify() and request.get_json()."""
+
+    # Numpy scalars/arrays (similarity scores, embeddings) serialize natively
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default, option=self.options
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize straight to bytes, skipping the str round trip of dumps()."""
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.options | orjson.OPT_APPEND_NEWLINE
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
 
 app = Flask(__name__)
-app.secret_key = os.getenv('FLASK_SECRET_KEY', 'kurzgesagt-rag-secret-key-2025')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+if Compress is not None:
+    # Audio is already compressed and SSE must not be buffered, so only text types
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html',
+                                        'text/css', 'application/javascript']
+    app.config['COMPRESS_LEVEL'] = 5
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+
+@functools.lru_cache(maxsize=64)
+def error_body(message):
+    """Serialize an error payload once per distinct message."""
+    return app.json.dumps({"error": message})
+
+def error_response(message, status):
+    """Build a fresh JSON error response from the cached body."""
+    return Response(error_body(message), status=status, mimetype='application/json')
+
+# Constant bodies only change on deploy, so browsers may reuse them for an hour
+STATIC_JSON_MAX_AGE = 3600
+
+@functools.lru_cache(maxsize=16)
+def static_etag(body):
+    """Hash a constant response body once."""
+    return hashlib.sha1(body).hexdigest()
+
+def static_json_response(body):
+    """Build a cacheable JSON response from a body serialized once at import time.
+
+    Answers 304 when the client's ETag matches (weak, so compression keeps it).
+    """
+    response = Response(body, mimetype='application/json')
+    response.set_etag(static_etag(body), weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_JSON_MAX_AGE
+    return response.make_conditional(request)
+
+# Session ids travel in the X-Session-Id header or a plain, unsigned cookie
+SESSION_COOKIE_NAME = 'session_id'
+SESSION_COOKIE_MAX_AGE = 86400
+
+# Background executor for long-running RAG work (task_id -> (future, submitted_at))
+TASK_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('TASK_WORKERS', '8')))
+TASKS = {}
+TASKS_LOCK = threading.Lock()
+TASK_TTL_SECONDS = 600
+
+# Pinecone index stats change slowly; reuse them briefly across /stats polls
+INDEX_STATS_TTL_SECONDS = 5.0
+INDEX_STATS_CACHE = {"value": None, "expires": 0.0}
+
+def init_rag_agent():
+    """Create the RAG agent, or return None if it cannot be initialized."""
+    try:
+        agent = KurzgesagtRAGAgent()
+        logger.info("%s", "✅ Kurzgesagt RAG Agent initialized successfully")
+    except Exception as e:  # Broad exception needed for initialization errors
+        logger.error("❌ Failed to initialize RAG Agent: %s", e)
+        return None
 
-# Initialize RAG agent with error handling
-try:
-    RAG_AGENT = KurzgesagtRAGAgent()
-    logger.info("%s", "✅ Kurzgesagt RAG Agent initialized successfully")
-except Exception as e:  # Broad exception needed for initialization errors
-    logger.error("❌ Failed to initialize RAG Agent: %s", e)
-    RAG_AGENT = None
+    try:
+        logger.info("🔥 RAG Agent warmed up in %.2fs", agent.warm_up())
+    except Exception as e:  # Broad exception needed for warm-up errors
+        logger.warning("⚠️ RAG Agent warm-up failed: %s", e)
+    return agent
+
+# Under Gunicorn each worker builds its own agent (gunicorn.conf.py), so a
+# preloading master never opens connections or threads that won't survive fork
+RAG_AGENT = None if os.getenv('RAG_AGENT_INIT_IN_WORKER') == '1' else init_rag_agent()
+
+def conditional_json(payload):
+    """Return payload as JSON with an ETag, or an empty 304 if the client's copy matches.
+
+    The ETag is weak so it survives response compression unchanged.
+    """
+    response = jsonify(payload)
+    response.add_etag(weak=True)
+    return response.make_conditional(request)
+
+def new_session_id():
+    """Generate a new random session id (22 URL-safe characters)."""
+    return secrets.token_urlsafe(16)
 
 def get_session_id():
-    """Get or create session ID for conversation tracking."""
-    if 'session_id' not in session:
-        session['session_id'] = str(uuid.uuid4())
-    return session['session_id']
+    """Get or create session ID for conversation tracking.
+
+    Reads the X-Session-Id header, then the session cookie. A new id is
+    sent back as a cookie on this response only.
+    """
+    session_id = (request.headers.get('X-Session-Id')
+                  or request.cookies.get(SESSION_COOKIE_NAME))
+    if not session_id:
+        session_id = new_session_id()
+        g.new_session_id = session_id
+    return session_id
+
+@app.after_request
+def set_session_cookie(response):
+    """Attach the cookie for a session id created during this request."""
+    session_id = g.pop('new_session_id', None)
+    if session_id:
+        response.set_cookie(SESSION_COOKIE_NAME, session_id,
+                            max_age=SESSION_COOKIE_MAX_AGE,
+                            httponly=True, samesite='Lax')
+    return response
 
 @app.route('/')
 def index():
@@ -83,22 +274,53 @@ def health_check():
     })
 
 def is_english_language(language):
-    """Check if the detected language is English."""
-    return (language and
-            (language.lower().startswith('en') or
-             language.lower() == 'english'))
-
-def validate_request_data(data):
-    """Validate and extract request data."""
-    if not data:
+    """Check if the detected language is English ("en", "en-US", "English (US)", ...)."""
+    return bool(language) and language.lower().startswith('en')
+
+# Questions are rejected before reaching the embedder when they are
+# oversized or contain no word characters at all
+MAX_QUESTION_LENGTH = int(os.getenv('MAX_QUESTION_LENGTH', '2000'))
+WORD_CHAR_RE = re.compile(r'\w')
+
+def validate_question(question):
+    """Reject oversized or meaningless questions. Returns (error_msg, error_code)."""
+    if len(question) > MAX_QUESTION_LENGTH:
+        return (f"Question is too long (maximum {MAX_QUESTION_LENGTH} characters)",
+                413)
+    if len(question) < 2 or not WORD_CHAR_RE.search(question):
+        return "Question must contain at least two characters and some words", 400
+    return None, None
+
+class AskRequest(msgspec.Struct):
+    """JSON body accepted by the /ask endpoints."""
+    question: str = ""
+    session_id: Optional[str] = None
+    mode: str = "normal"
+
+ASK_REQUEST_DECODER = msgspec.json.Decoder(AskRequest)
+
+def validate_request_data(body):
+    """Decode the raw request body into an AskRequest and validate it."""
+    if not body:
         return None, "No JSON data provided", 400
 
-    question = data.get('question', '').strip()
+    try:
+        ask_request = ASK_REQUEST_DECODER.decode(body)
+    except msgspec.ValidationError as e:
+        return None, f"Invalid request data: {e}", 400
+    except msgspec.DecodeError:
+        return None, "Invalid JSON data", 400
+
+    question = ask_request.question.strip()
     if not question:
         return None, "Question is required", 400
 
-    session_id = data.get('session_id') or get_session_id()
-    mode = data.get('mode', 'normal')
+    error_msg, error_code = validate_question(question)
+    if error_msg:
+        return None, error_msg, error_code
+
+    session_id = ask_request.session_id or get_session_id()
+    mode = ask_request.mode
 
     return {
         'question': question,
@@ -106,101 +328,196 @@ def validate_request_data(data):
         'mode': mode
     }, None, None
 
-def format_structured_response(answer_data, matches, language, session_id, mode):
-    """Format structured response from RAG agent."""
-    detected_language = answer_data.get('language', language)
-    tts_available = is_english_language(detected_language)
-
+def build_answer_response(result, session_id, mode):
+    """Build the answer payload shared by /ask and /chat/message."""
+    answer_data = result.answer
+    detected_language = answer_data['language']
     return {
-        "answer": answer_data.get('answer', 'No answer available'),
-        "confidence": answer_data.get('confidence', 'medium'),
-        "sources": answer_data.get('sources', []),
-        "sources_used": answer_data.get('sources_used', len(matches)),
+        "answer": answer_data['answer'],
+        "confidence": answer_data['confidence'],
+        "sources": answer_data['sources'],
+        "sources_used": answer_data['sources_used'],
         "language": detected_language,
         "session_id": session_id,
-        "is_follow_up": answer_data.get('is_follow_up', False),
+        "is_follow_up": answer_data['is_follow_up'],
         "mode": mode,
-        "tts_available": tts_available
+        "tts_available": is_english_language(detected_language),
+        "cache": "hit" if result.cached else "miss"
     }
 
-def format_simple_response(answer_data, matches, language, session_id, mode):
-    """Format simple response for fallback cases."""
-    tts_available = is_english_language(language)
-
-    return {
-        "answer": str(answer_data),
-        "confidence": "medium",
-        "sources": [match.metadata.get('video_title', 'Unknown')
-                   for match in matches],
-        "sources_used": len(matches),
-        "language": language,
-        "session_id": session_id,
-        "is_follow_up": False,
-        "mode": mode,
-        "tts_available": tts_available
-    }
+def answer_question(question, session_id, mode):
+    """Run the RAG agent and format its answer as a response dict."""
+    logger.info("Processing question from session %s in %s mode...",
+               session_id[:8], mode)
+
+    # Generate answer using RAG agent with specified mode
+    result = RAG_AGENT.generate_answer(question, session_id, mode=mode)
+    response = build_answer_response(result, session_id, mode)
+
+    logger.info("Successfully processed question with confidence: %s",
+               response['confidence'])
+    return response
+
+def submit_task(func, *args, **kwargs):
+    """Run func in the background executor and return its task id."""
+    now = time.monotonic()
+    task_id = uuid.uuid4().hex
+    with TASKS_LOCK:
+        # Drop finished results nobody collected
+        expired = [
+            tid for tid, (future, submitted_at) in TASKS.items()
+            if future.done() and now - submitted_at > TASK_TTL_SECONDS
+        ]
+        for tid in expired:
+            del TASKS[tid]
+        TASKS[task_id] = (TASK_EXECUTOR.submit(func, *args, **kwargs), now)
+    return task_id
 
 @app.route('/ask', methods=['POST'])
 def ask_question():
     """Process user questions and return AI responses."""
     if not RAG_AGENT:
-        return jsonify({
-            "error": "RAG Agent not available. Please check server configuration."
-        }), 503
+        return error_response(
+            "RAG Agent not available. Please check server configuration.", 503
+        )
 
     try:
-        data = request.get_json()
-        validated_data, error_msg, error_code = validate_request_data(data)
+        validated_data, error_msg, error_code = validate_request_data(
+            request.get_data()
+        )
 
         if error_msg:
-            return jsonify({"error": error_msg}), error_code
+            return error_response(error_msg, error_code)
 
-        question = validated_data['question']
-        session_id = validated_data['session_id']
-        mode = validated_data['mode']
+        response = answer_question(
+            validated_data['question'],
+            validated_data['session_id'],
+            validated_data['mode']
+        )
+        return jsonify(response)
 
-        logger.info("Processing question from session %s in %s mode...",
-                   session_id[:8], mode)
+    except Exception as e:  # Broad exception needed for error handling
+        logger.error("Error processing question: %s", e)
+        return jsonify({
+            "error": f"An error occurred while processing your question: {str(e)}"
+        }), 500
 
-        # Generate answer using RAG agent with specified mode
-        result = RAG_AGENT.generate_answer(question, session_id, mode=mode)
+def sse_event(payload):
+    """Format a payload as a Server-Sent Events data message."""
+    return f"data: {app.json.dumps(payload)}\n\n"
 
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer_data, matches, language = result
-        else:
-            return jsonify({"error": "Invalid response format from RAG agent"}), 500
+@app.route('/ask/stream', methods=['POST'])
+def ask_question_stream():
+    """Stream the answer as Server-Sent Events while the LLM generates it."""
+    if not RAG_AGENT:
+        return error_response(
+            "RAG Agent not available. Please check server configuration.", 503
+        )
 
-        # Format response based on data type
-        if isinstance(answer_data, dict):
-            response = format_structured_response(
-                answer_data, matches, language, session_id, mode
-            )
-        else:
-            response = format_simple_response(
-                answer_data, matches, language, session_id, mode
-            )
+    validated_data, error_msg, error_code = validate_request_data(
+        request.get_data()
+    )
 
-        logger.info("Successfully processed question with confidence: %s",
-                   response['confidence'])
-        return jsonify(response)
+    if error_msg:
+        return error_response(error_msg, error_code)
+
+    question = validated_data['question']
+    session_id = validated_data['session_id']
+    mode = validated_data['mode']
+    token_queue = queue.SimpleQueue()
+    future = TASK_EXECUTOR.submit(
+        RAG_AGENT.generate_answer, question, session_id,
+        mode=mode, on_token=token_queue.put
+    )
+    future.add_done_callback(lambda _: token_queue.put(None))
+
+    def generate():
+        while True:
+            text = token_queue.get()
+            if text is None:
+                break
+            yield sse_event({"type": "token", "text": text})
+        try:
+            result = future.result()
+        except Exception as e:  # Broad exception needed for error handling
+            logger.error("Error streaming answer: %s", e)
+            yield sse_event({"type": "error", "error": str(e)})
+            return
+        yield sse_event({
+            "type": "final",
+            **build_answer_response(result, session_id, mode)
+        })
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache',
+                             'X-Accel-Buffering': 'no'})
+
+@app.route('/ask/async', methods=['POST'])
+def ask_question_async():
+    """Queue a question for background processing and return a task id."""
+    if not RAG_AGENT:
+        return error_response(
+            "RAG Agent not available. Please check server configuration.", 503
+        )
+
+    validated_data, error_msg, error_code = validate_request_data(
+        request.get_data()
+    )
 
+    if error_msg:
+        return error_response(error_msg, error_code)
+
+    task_id = submit_task(
+        answer_question,
+        validated_data['question'],
+        validated_data['session_id'],
+        validated_data['mode']
+    )
+    return jsonify({
+        "task_id": task_id,
+        "status": "pending",
+        "status_url": f"/task/{task_id}"
+    }), 202
+
+@app.route('/task/<task_id>', methods=['GET'])
+def get_task_result(task_id):
+    """Return the result of a background task, or its pending status."""
+    with TASKS_LOCK:
+        entry = TASKS.get(task_id)
+
+    if entry is None:
+        return error_response("Unknown or expired task id", 404)
+
+    future, _ = entry
+    if not future.done():
+        return jsonify({"task_id": task_id, "status": "pending"}), 202
+
+    with TASKS_LOCK:
+        TASKS.pop(task_id, None)
+
+    try:
+        result = future.result()
     except Exception as e:  # Broad exception needed for error handling
-        logger.error("Error processing question: %s", e)
+        logger.error("Error in background task %s: %s", task_id, e)
         return jsonify({
+            "task_id": task_id,
+            "status": "failed",
             "error": f"An error occurred while processing your question: {str(e)}"
         }), 500
 
+    return jsonify({"task_id": task_id, "status": "done", "result": result})
+
 @app.route('/conversation/context', methods=['GET'])
 def get_conversation_context():
     """Get current conversation context for a session."""
     if not RAG_AGENT:
-        return jsonify({"error": "RAG Agent not available"}), 503
+        return error_response("RAG Agent not available", 503)
 
     try:
         session_id = request.args.get('session_id') or get_session_id()
         context = RAG_AGENT.get_conversation_context(session_id)
 
-        return jsonify({
+        return conditional_json({
             "session_id": session_id,
             "context": context
         })
@@ -212,11 +529,11 @@ def get_conversation_context():
 def clear_conversation():
     """Clear conversation history for a session."""
     if not RAG_AGENT:
-        return jsonify({"error": "RAG Agent not available"}), 503
+        return error_response("RAG Agent not available", 503)
 
     try:
-        data = request.get_json()
-        session_id = data.get('session_id') if data else get_session_id()
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id') or get_session_id()
 
         RAG_AGENT.clear_conversation(session_id)
 
@@ -228,50 +545,58 @@ def clear_conversation():
         logger.error("Error clearing conversation: %s", e)
         return jsonify({"error": str(e)}), 500
 
+def get_index_stats(agent):
+    """Get knowledge base stats, refreshing from Pinecone at most every few seconds."""
+    now = time.monotonic()
+    if now < INDEX_STATS_CACHE["expires"]:
+        return INDEX_STATS_CACHE["value"]
+    index_stats = agent.index.describe_index_stats()
+    knowledge_base = {
+        "total_vectors": index_stats.total_vector_count,
+        "dimension": index_stats.dimension
+    }
+    INDEX_STATS_CACHE["value"] = knowledge_base
+    INDEX_STATS_CACHE["expires"] = now + INDEX_STATS_TTL_SECONDS
+    return knowledge_base
+
 @app.route('/stats')
 def get_stats():
     """Get system statistics."""
-    if not RAG_AGENT:
-        return jsonify({"error": "RAG Agent not available"}), 503
+    agent = RAG_AGENT
+    if not agent:
+        return error_response("RAG Agent not available", 503)
 
     try:
-        # Get memory stats
-        memory_stats = RAG_AGENT.get_memory_stats()
-
-        # Get index stats
-        index_stats = RAG_AGENT.index.describe_index_stats()
-
-        return jsonify({
-            "memory_stats": memory_stats,
-            "knowledge_base": {
-                "total_vectors": index_stats.total_vector_count,
-                "dimension": index_stats.dimension
-            },
+        return conditional_json({
+            "memory_stats": agent.get_memory_stats(),
+            "knowledge_base": get_index_stats(agent),
             "agent_status": "online"
         })
     except Exception as e:  # Broad exception needed for error handling
         logger.error("Error getting stats: %s", e)
         return jsonify({"error": str(e)}), 500
 
+MODES_BODY = app.json.dumps({
+    "modes": [
+        {
+            "id": "normal",
+            "name": "Kurzgesagt Style",
+            "description": "Educational and enthusiastic science communication",
+            "emoji": "🧠"
+        },
+        {
+            "id": "crazy_scientist",
+            "name": "Rick Sanchez Mode",
+            "description": "Sarcastic genius scientist with burps and attitude",
+            "emoji": "🧪"
+        }
+    ]
+}).encode('utf-8')
+
 @app.route('/modes', methods=['GET'])
 def get_available_modes():
     """Get available conversation modes."""
-    return jsonify({
-        "modes": [
-            {
-                "id": "normal",
-                "name": "Kurzgesagt Style",
-                "description": "Educational and enthusiastic science communication",
-                "emoji": "🧠"
-            },
-            {
-                "id": "crazy_scientist",
-                "name": "Rick Sanchez Mode",
-                "description": "Sarcastic genius scientist with burps and attitude",
-                "emoji": "🧪"
-            }
-        ]
-    })
+    return static_json_response(MODES_BODY)
 
 
 
@@ -279,10 +604,10 @@ def get_available_modes():
 def start_chat():
     """Start an interactive chat session."""
     if not RAG_AGENT:
-        return jsonify({"error": "RAG Agent not available"}), 503
+        return error_response("RAG Agent not available", 503)
 
     try:
-        session_id = str(uuid.uuid4())
+        session_id = new_session_id()
 
         return jsonify({
             "session_id": session_id,
@@ -307,19 +632,19 @@ def start_chat():
 def chat_message():
     """Send a message in the chat session."""
     if not RAG_AGENT:
-        return jsonify({"error": "RAG Agent not available"}), 503
+        return error_response("RAG Agent not available", 503)
 
     try:
         data = request.get_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return error_response("No JSON data provided", 400)
 
         message = data.get('message', '').strip()
-        session_id = data.get('session_id', str(uuid.uuid4()))
+        session_id = data.get('session_id') or get_session_id()
         mode = data.get('mode', 'normal')  # Ensure mode is tracked in chat
 
         if not message:
-            return jsonify({"error": "Message is required"}), 400
+            return error_response("Message is required", 400)
 
         # Handle special commands
         if message.lower() == 'examples':
@@ -339,53 +664,16 @@ def chat_message():
                 "mode": mode  # Include mode for consistency
             })
 
-        # Process the question
-        result = RAG_AGENT.generate_answer(message, session_id, mode=mode)
+        error_msg, error_code = validate_question(message)
+        if error_msg:
+            return error_response(error_msg, error_code)
 
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer_data, matches, language = result
-        else:
-            return jsonify({"error": "Invalid response format from RAG agent"}), 500
-
-        # Extract structured response
-        if isinstance(answer_data, dict):
-            detected_language = answer_data.get('language', language)
-            tts_available = (detected_language and
-                           (detected_language.lower().startswith('en') or
-                            detected_language.lower() == 'english'))
-            response = {
-                "type": "answer",
-                "question": message,
-                "answer": answer_data.get('answer', 'No answer available'),
-                "confidence": answer_data.get('confidence', 'medium'),
-                "sources": answer_data.get('sources', []),
-                "sources_used": answer_data.get('sources_used', len(matches)),
-                "language": detected_language,
-                "session_id": session_id,
-                "is_follow_up": answer_data.get('is_follow_up', False),
-                "tts_available": tts_available,
-                "mode": mode  # Add mode to response
-            }
-        else:
-            # Fallback for simple string responses
-            # Only enable TTS for English responses
-            tts_available = (language and
-                           (language.lower().startswith('en') or
-                            language.lower() == 'english'))
-            response = {
-                "type": "answer",
-                "question": message,
-                "answer": str(answer_data),
-                "confidence": "medium",
-                "sources": [match.metadata.get('video_title', 'Unknown')
-                           for match in matches],
-                "sources_used": len(matches),
-                "language": language,
-                "session_id": session_id,
-                "is_follow_up": False,
-                "tts_available": tts_available,
-                "mode": mode  # Add mode to response
-            }
+        # Process the question
+        response = {
+            "type": "answer",
+            "question": message,
+            **answer_question(message, session_id, mode)
+        }
 
         return jsonify(response)
 
@@ -393,19 +681,7 @@ def chat_message():
         logger.error("Error processing chat message: %s", e)
         return jsonify({"error": str(e)}), 500
 
-@app.route('/examples')
-def get_examples():
-    """Get multilingual example questions."""
-    examples = get_multilingual_examples()
-    return jsonify({
-        "examples": examples,
-        "instructions": ("You can ask questions in any language you're comfortable with! "
-                        "The system will detect your language and respond accordingly.")
-    })
-
-def get_multilingual_examples():
-    """Get example questions in multiple languages."""
-    return [
+MULTILINGUAL_EXAMPLES = (
         {"language": "English", "question": "How does the immune system protect us from diseases?"},
         {"language": "Spanish", "question": "¿Cómo funciona el sistema inmunológico?"},
         {"language": "French", "question": "Comment fonctionne le système immunitaire?"},
@@ -420,18 +696,33 @@ def get_multilingual_examples():
         {"language": "English", "question": "Why should we worry about nuclear war?"},
         {"language": "Spanish",
          "question": "¿Por qué deberíamos preocuparnos por la guerra nuclear?"}
-    ]
+)
+
+EXAMPLES_BODY = app.json.dumps({
+    "examples": MULTILINGUAL_EXAMPLES,
+    "instructions": ("You can ask questions in any language you're comfortable with! "
+                    "The system will detect your language and respond accordingly.")
+}).encode('utf-8')
+
+@app.route('/examples')
+def get_examples():
+    """Get multilingual example questions."""
+    return static_json_response(EXAMPLES_BODY)
+
+def get_multilingual_examples():
+    """Get example questions in multiple languages."""
+    return MULTILINGUAL_EXAMPLES
 
 @app.errorhandler(404)
 def not_found(_error):
     """Handle 404 errors."""
-    return jsonify({"error": "Endpoint not found"}), 404
+    return error_response("Endpoint not found", 404)
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error("Internal server error: %s", error)
-    return jsonify({"error": "Internal server error"}), 500
+    return error_response("Internal server error", 500)
 
 class TTSConfig:
     """Configuration for TTS generation."""
@@ -442,75 +733,101 @@ class TTSConfig:
         self.provider = provider
         self.voice_id = voice_id
 
-def create_tts_response(tts_config, message):
-    """Create TTS response with cleaned text."""
-    client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-    audio = None
+def collect_audio_bytes(audio):
+    """Concatenate an SDK audio result (bytes or an iterator of chunks) into bytes."""
+    if isinstance(audio, (bytes, bytearray)) or not hasattr(audio, '__iter__'):
+        return audio
+    buffer = io.BytesIO()
+    for chunk in audio:
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+def resolve_tts_call(client):
+    """Pick the SDK's synthesis method once; returns a (text, voice_id) -> audio callable."""
+    if client is None:
+        return None
 
-    # Try the latest SDK method first
-    if hasattr(client, 'tts') and callable(client.tts):
-        try:
-            audio = client.tts(
-                text=tts_config.cleaned_text,
-                voice=tts_config.voice_id,
-                model="eleven_multilingual_v2"
-            )
-        except TypeError as e:
-            logger.warning("[TTS] 'tts' did not accept 'voice' or 'model', "
-                          "trying alternatives: %s", e)
-            try:
-                audio = client.tts(
-                    text=tts_config.cleaned_text,
-                    voice=tts_config.voice_id
-                )
-            except TypeError as e2:
-                logger.warning("[TTS] 'tts' did not accept 'voice', "
-                              "trying 'voice_id': %s", e2)
-                try:
-                    audio = client.tts(
-                        text=tts_config.cleaned_text,
-                        voice_id=tts_config.voice_id,
-                        model="eleven_multilingual_v2"
-                    )
-                except TypeError as e3:
-                    logger.warning("[TTS] 'tts' did not accept 'voice_id' or "
-                                  "'model', trying without 'model': %s", e3)
-                    audio = client.tts(
-                        text=tts_config.cleaned_text,
-                        voice_id=tts_config.voice_id
-                    )
-    elif (hasattr(client, 'text_to_speech') and
-          hasattr(client.text_to_speech, 'convert') and
-          callable(client.text_to_speech.convert)):
+    tts = getattr(client, 'tts', None)
+    if callable(tts):
+        # Older SDKs: match the keyword names of this version's tts() signature
         try:
-            audio = client.text_to_speech.convert(
-                text=tts_config.cleaned_text,
-                voice_id=tts_config.voice_id
-            )
-        except Exception as e:
-            logger.error("[TTS] ElevenLabs convert() failed: %s", e)
-            return jsonify({
-                "error": f"ElevenLabs TTS failed: {e}",
-                "tts_provider": "elevenlabs",
-                "voice_id": tts_config.voice_id
-            }), 500
-    else:
-        logger.error("No compatible ElevenLabs TTS method found in SDK. "
-                    "Please update the elevenlabs package.")
+            params = inspect.signature(tts).parameters
+        except (TypeError, ValueError):
+            params = {}
+        takes_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        voice_kw = 'voice_id' if 'voice_id' in params and 'voice' not in params else 'voice'
+        extra = {'model': ELEVENLABS_MODEL_ID} if 'model' in params or takes_any else {}
+        return lambda text, voice_id: tts(text=text, **{voice_kw: voice_id}, **extra)
+
+    convert = getattr(getattr(client, 'text_to_speech', None), 'convert', None)
+    if callable(convert):
+        return lambda text, voice_id: convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=ELEVENLABS_MODEL_ID,
+            output_format=TTS_OUTPUT_FORMAT
+        )
+
+    logger.error("No compatible ElevenLabs TTS method found in SDK. "
+                "Please update the elevenlabs package.")
+    return None
+
+# Resolved once at import instead of probing the SDK on every request
+ELEVENLABS_TTS_CALL = resolve_tts_call(ELEVENLABS_CLIENT)
+
+def synthesize_elevenlabs_audio(tts_config):
+    """Synthesize audio with ElevenLabs, returning (audio_bytes, error_msg)."""
+    if ELEVENLABS_TTS_CALL is None:
+        return None, ("No compatible ElevenLabs TTS method found in SDK. "
+                      "Please update the elevenlabs package.")
+    try:
+        audio = ELEVENLABS_TTS_CALL(tts_config.cleaned_text, tts_config.voice_id)
+        return collect_audio_bytes(audio), None
+    except Exception as e:  # Broad exception needed for SDK/API errors
+        logger.error("[TTS] ElevenLabs synthesis failed: %s", e)
+        return None, f"ElevenLabs TTS failed: {e}"
+
+def get_or_synthesize_audio(tts_config):
+    """Return (audio_bytes, error_msg), reusing cached audio when possible."""
+    cache_key = make_tts_key(
+        tts_config.cleaned_text, tts_config.voice_id,
+        ELEVENLABS_MODEL_ID, TTS_OUTPUT_FORMAT
+    )
+    audio_bytes = TTS_CACHE.get(cache_key)
+    if audio_bytes is not None:
+        logger.info("[TTS] Cache hit for voice_id: %s", tts_config.voice_id)
+        return audio_bytes, None
+
+    audio_bytes, error_msg = synthesize_elevenlabs_audio(tts_config)
+    if not error_msg:
+        TTS_CACHE.add(cache_key, audio_bytes)
+    return audio_bytes, error_msg
+
+def create_tts_response(tts_config, message):
+    """Create TTS response with cleaned text, reusing cached audio when possible."""
+    audio_bytes, error_msg = get_or_synthesize_audio(tts_config)
+    if error_msg:
         return jsonify({
-            "error": ("No compatible ElevenLabs TTS method found in SDK. "
-                     "Please update the elevenlabs package."),
+            "error": error_msg,
             "tts_provider": "elevenlabs",
             "voice_id": tts_config.voice_id
         }), 500
 
-    if isinstance(audio, (types.GeneratorType, list, tuple)) or hasattr(audio, '__iter__'):
-        audio_bytes = b''.join(
-            chunk if isinstance(chunk, bytes) else bytes(chunk)
-            for chunk in audio
-        )
-    else:
-        audio_bytes = audio
+    return build_audio_response(audio_bytes, tts_config, message)
+
+def wants_binary_audio():
+    """Check whether the client prefers raw audio over base64-in-JSON."""
+    best = request.accept_mimetypes.best_match(['application/json', 'audio/mpeg'])
+    return best == 'audio/mpeg'
+
+def build_audio_response(audio_bytes, tts_config, message):
+    """Return audio as raw MP3 bytes or, for legacy clients, base64 in JSON."""
+    if wants_binary_audio():
+        return Response(audio_bytes, mimetype='audio/mpeg', headers={
+            "X-TTS-Provider": tts_config.provider,
+            "X-TTS-Voice": tts_config.voice_id,
+            "X-TTS-Language": tts_config.language
+        })
 
     audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
     return jsonify({
@@ -524,68 +841,51 @@ def create_tts_response(tts_config, message):
         "message": message
     })
 
+# Mode -> (voice_id, provider); unknown modes use the default ElevenLabs voice
+VOICE_BY_MODE = {
+    'crazy_scientist': (RICK_VOICE_ID, 'elevenlabs_rick'),
+    'normal': (KURZGESAGT_VOICE_ID, 'elevenlabs_kurzgesagt'),
+}
+DEFAULT_VOICE = (ELEVENLABS_VOICE_ID, 'elevenlabs')
+
 def determine_voice_config(mode, language):
     """Determine voice configuration based on mode and language."""
-    is_english = (language.lower().startswith('en') or
-                 language.lower() == 'english')
-    mode_clean = (mode or '').strip().lower()
-
-    if mode_clean == 'crazy_scientist':
-        voice_id = RICK_VOICE_ID
-        provider = 'elevenlabs_rick'
-    elif mode_clean == 'normal':
-        voice_id = KURZGESAGT_VOICE_ID
-        provider = 'elevenlabs_kurzgesagt'
-    else:
-        voice_id = ELEVENLABS_VOICE_ID
-        provider = 'elevenlabs'
+    voice_id, provider = VOICE_BY_MODE.get((mode or '').strip().lower(), DEFAULT_VOICE)
+    return voice_id, provider, is_english_language(language)
 
-    return voice_id, provider, is_english
+# 'burp' markers in Rick answers are replaced by a sound effect
+BURP_RE = re.compile(r'\bburp\b', re.IGNORECASE)
+BURP_SPLIT_RE = re.compile(r'(\bburp\b)', re.IGNORECASE)
 
 def handle_rick_burp_tts(text, voice_id, provider, language):
-    """Handle Rick mode TTS with burp sound effects."""
-    cleaned_text = clean_text_for_natural_speech(text, language)
-    client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
+    """Handle Rick mode TTS with burp sound effects.
+
+    Returns (TTSConfig, audio_bytes), or None if no segment could be generated.
+    """
+    cleaned_text = prepare_elevenlabs_text(text, language)
     logger.info('[TTS] Rick mode: inserting burp sound for \'burp\' marker')
 
     # Split text on 'burp' (case-insensitive, keep delimiter)
-    parts = re.split(r'(\bburp\b)', cleaned_text, flags=re.IGNORECASE)
+    parts = BURP_SPLIT_RE.split(cleaned_text)
     segments = []
     burp_path = os.path.join(app.root_path, 'static', 'audio', 'burp.mp3')
     burp_audio = AudioSegment.from_file(burp_path, format='mp3')
 
     for part in parts:
-        if re.match(r'\bburp\b', part, re.IGNORECASE):
+        if BURP_RE.match(part):
             segments.append(burp_audio)
         else:
             seg = part.strip()
             if seg:
                 try:
-                    tts_audio = None
-                    if hasattr(client, 'tts') and callable(client.tts):
-                        try:
-                            tts_audio = client.tts(
-                                text=seg,
-                                voice=voice_id,
-                                model="eleven_multilingual_v2"
-                            )
-                        except TypeError:
-                            tts_audio = client.tts(text=seg, voice=voice_id)
-                    elif (hasattr(client, 'text_to_speech') and
-                          hasattr(client.text_to_speech, 'convert') and
-                          callable(client.text_to_speech.convert)):
-                        tts_audio = client.text_to_speech.convert(
-                            text=seg, voice_id=voice_id
-                        )
-
-                    if (isinstance(tts_audio, (types.GeneratorType, list, tuple)) or
-                        hasattr(tts_audio, '__iter__')):
-                        tts_bytes = b''.join(
-                            chunk if isinstance(chunk, bytes) else bytes(chunk)
-                            for chunk in tts_audio
-                        )
-                    else:
-                        tts_bytes = tts_audio
+                    cache_key = make_tts_key(
+                        seg, voice_id, ELEVENLABS_MODEL_ID, TTS_OUTPUT_FORMAT
+                    )
+                    tts_bytes = TTS_CACHE.get(cache_key)
+                    if tts_bytes is None:
+                        tts_audio = ELEVENLABS_TTS_CALL(seg, voice_id)
+                        tts_bytes = collect_audio_bytes(tts_audio)
+                        TTS_CACHE.add(cache_key, tts_bytes)
 
                     tts_segment = AudioSegment.from_file(
                         io.BytesIO(tts_bytes), format='mp3'
@@ -603,18 +903,9 @@ def handle_rick_burp_tts(text, voice_id, provider, language):
 
     out_buffer = io.BytesIO()
     combined.export(out_buffer, format='mp3')
-    audio_base64 = base64.b64encode(out_buffer.getvalue()).decode('utf-8')
 
-    return {
-        "text": cleaned_text,
-        "original_text": text,
-        "language": language,
-        "audio_base64": audio_base64,
-        "audio_format": "mp3",
-        "provider": provider,
-        "voice_id": voice_id,
-        "message": "High-quality Rick TTS with burp sound(s)"
-    }
+    tts_config = TTSConfig(cleaned_text, text, language, provider, voice_id)
+    return tts_config, out_buffer.getvalue()
 
 @app.route('/voice/speak', methods=['POST'])
 def text_to_speech():
@@ -622,14 +913,14 @@ def text_to_speech():
     try:
         data = request.get_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return error_response("No JSON data provided", 400)
 
         text = data.get('text', '').strip()
         language = data.get('language', 'en-US')
         mode = data.get('mode', 'normal')
 
         if not text:
-            return jsonify({"error": "Text is required"}), 400
+            return error_response("Text is required", 400)
 
         voice_id, provider, is_english = determine_voice_config(mode, language)
 
@@ -641,19 +932,23 @@ def text_to_speech():
         if is_english and ELEVENLABS_AVAILABLE:
             # Rick mode: handle 'burp' as a sound effect
             if (mode_clean == 'crazy_scientist' and
-                re.search(r'\bburp\b', text, re.IGNORECASE)):
+                BURP_RE.search(text)):
 
                 result = handle_rick_burp_tts(text, voice_id, provider, language)
                 if result:
-                    return jsonify(result)
-                
+                    tts_config, audio_bytes = result
+                    return build_audio_response(
+                        audio_bytes, tts_config,
+                        "High-quality Rick TTS with burp sound(s)"
+                    )
+
                 return jsonify({
                     "error": "No audio segments generated for Rick TTS with burp."
                 }), 500
 
             # Standard ElevenLabs TTS
             try:
-                cleaned_text = clean_text_for_natural_speech(text, language)
+                cleaned_text = prepare_elevenlabs_text(text, language)
                 message = (f"High-quality ElevenLabs voice synthesis for "
                           f"{get_language_name(language)}")
 
@@ -685,84 +980,287 @@ def text_to_speech():
         logger.error("Error in text-to-speech: %s", e)
         return jsonify({"error": str(e)}), 500
 
+def generate_elevenlabs_tts(text, voice_id, provider, language, mode):
+    """Synthesize ElevenLabs audio off the request thread.
+
+    Returns (TTSConfig, audio_bytes, message); raises RuntimeError on failure.
+    """
+    if mode == 'crazy_scientist' and BURP_RE.search(text):
+        result = handle_rick_burp_tts(text, voice_id, provider, language)
+        if not result:
+            raise RuntimeError("No audio segments generated for Rick TTS with burp.")
+        tts_config, audio_bytes = result
+        return tts_config, audio_bytes, "High-quality Rick TTS with burp sound(s)"
+
+    cleaned_text = prepare_elevenlabs_text(text, language)
+    tts_config = TTSConfig(cleaned_text, text, language, provider, voice_id)
+    audio_bytes, error_msg = get_or_synthesize_audio(tts_config)
+    if error_msg:
+        raise RuntimeError(error_msg)
+    message = (f"High-quality ElevenLabs voice synthesis for "
+              f"{get_language_name(language)}")
+    return tts_config, audio_bytes, message
+
+@app.route('/voice/speak/async', methods=['POST'])
+def text_to_speech_async():
+    """Queue ElevenLabs synthesis in the background and return a task id."""
+    data = request.get_json(silent=True)
+    if not data:
+        return error_response("No JSON data provided", 400)
+
+    text = data.get('text', '').strip()
+    language = data.get('language', 'en-US')
+    mode = (data.get('mode') or 'normal').strip().lower()
+
+    if not text:
+        return error_response("Text is required", 400)
+
+    if not ELEVENLABS_AVAILABLE:
+        return error_response("ElevenLabs not available; use /voice/speak", 503)
+
+    voice_id, provider, is_english = determine_voice_config(mode, language)
+    if not is_english:
+        return error_response(
+            "Background TTS is only available for English; use /voice/speak", 400
+        )
+
+    task_id = submit_task(
+        generate_elevenlabs_tts, text, voice_id, provider, language, mode
+    )
+    return jsonify({
+        "task_id": task_id,
+        "status": "pending",
+        "status_url": f"/voice/result/{task_id}"
+    }), 202
+
+@app.route('/voice/result/<task_id>', methods=['GET'])
+def get_tts_result(task_id):
+    """Return the audio of a background TTS task, or its pending status."""
+    with TASKS_LOCK:
+        entry = TASKS.get(task_id)
+
+    if entry is None:
+        return error_response("Unknown or expired task id", 404)
+
+    future, _ = entry
+    if not future.done():
+        return jsonify({"task_id": task_id, "status": "pending"}), 202
+
+    with TASKS_LOCK:
+        TASKS.pop(task_id, None)
+
+    try:
+        tts_config, audio_bytes, message = future.result()
+    except Exception as e:  # Broad exception needed for error handling
+        logger.error("Error in background TTS task %s: %s", task_id, e)
+        return jsonify({
+            "task_id": task_id,
+            "status": "failed",
+            "error": str(e)
+        }), 500
+
+    return build_audio_response(audio_bytes, tts_config, message)
+
+def stream_elevenlabs_audio(tts_config, cache_key):
+    """Yield MP3 chunks from ElevenLabs, caching the full clip once it completes."""
+    client = ELEVENLABS_CLIENT
+    buffer = io.BytesIO()
+    for chunk in client.text_to_speech.stream(
+        voice_id=tts_config.voice_id,
+        text=tts_config.cleaned_text,
+        model_id=ELEVENLABS_MODEL_ID,
+        output_format=TTS_OUTPUT_FORMAT
+    ):
+        if chunk:
+            buffer.write(chunk)
+            yield chunk
+    TTS_CACHE.add(cache_key, buffer.getvalue())
+
+@app.route('/voice/stream', methods=['POST'])
+def stream_text_to_speech():
+    """Stream ElevenLabs speech as MP3 chunks so playback can start early."""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return error_response("No JSON data provided", 400)
+
+        text = data.get('text', '').strip()
+        language = data.get('language', 'en-US')
+        mode = data.get('mode', 'normal')
+
+        if not text:
+            return error_response("Text is required", 400)
+
+        voice_id, provider, is_english = determine_voice_config(mode, language)
+        if not (ELEVENLABS_CLIENT_AVAILABLE and ELEVENLABS_API_KEY):
+            return error_response("ElevenLabs not available", 503)
+        if not is_english:
+            return error_response(
+                "Streaming TTS is only available for English; use /voice/speak", 400
+            )
+
+        tts_config = TTSConfig(
+            prepare_elevenlabs_text(text, language), text, language,
+            provider, voice_id
+        )
+        headers = {
+            "X-TTS-Provider": tts_config.provider,
+            "X-TTS-Voice": tts_config.voice_id,
+            "X-TTS-Language": tts_config.language
+        }
+
+        # Rick's burps are spliced in with pydub, which needs the whole clip
+        if ((mode or '').strip().lower() == 'crazy_scientist' and
+                BURP_RE.search(text)):
+            result = handle_rick_burp_tts(text, voice_id, provider, language)
+            if not result:
+                return jsonify({
+                    "error": "No audio segments generated for Rick TTS with burp."
+                }), 500
+            return Response(result[1], mimetype='audio/mpeg', headers=headers)
+
+        cache_key = make_tts_key(
+            tts_config.cleaned_text, tts_config.voice_id,
+            ELEVENLABS_MODEL_ID, TTS_OUTPUT_FORMAT
+        )
+        audio_bytes = TTS_CACHE.get(cache_key)
+        if audio_bytes is not None:
+            return Response(audio_bytes, mimetype='audio/mpeg', headers=headers)
+
+        # Pull the first chunk now so upstream errors become a JSON 500
+        audio_stream = stream_elevenlabs_audio(tts_config, cache_key)
+        first_chunk = next(audio_stream, b'')
+
+        def generate():
+            yield first_chunk
+            yield from audio_stream
+
+        return Response(generate(), mimetype='audio/mpeg', headers=headers)
+    except Exception as e:  # Broad exception needed for TTS errors
+        logger.error("Error in streaming text-to-speech: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+def prepare_elevenlabs_text(text, language):
+    """Prepare text for ElevenLabs, skipping cleanup when the model normalizes it.
+
+    Normalizer-equipped models handle abbreviations and symbols server-side,
+    so the regex cleanup is skipped. Trade-off: markdown markers and a few
+    abbreviations (e.g. 'AI', 'CO2') are read as written.
+    """
+    if ELEVENLABS_MODEL_ID in NORMALIZING_MODELS:
+        return text
+    return clean_text_for_natural_speech(text, language)
+
+# Patterns for speech text cleanup, compiled once at import
+MARKDOWN_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+MARKDOWN_ITALIC_RE = re.compile(r'\*(.*?)\*')
+MARKDOWN_CODE_RE = re.compile(r'`(.*?)`')
+EN_ABBREVIATIONS = {
+    'Dr.': 'Doctor',
+    'Mr.': 'Mister',
+    'Mrs.': 'Missus',
+    'etc.': 'etcetera',
+    'AI': 'artificial intelligence',
+    'CO2': 'carbon dioxide'
+}
+EN_ABBREVIATION_RE = re.compile(r'\b(?:Dr|Mr|Mrs|etc)\.|\b(?:AI|CO2)\b')
+COMMA_SPACING_RE = re.compile(r',\s*')
+COLON_SPACING_RE = re.compile(r':\s*')
+WHITESPACE_RE = re.compile(r'\s+')
+
 def clean_text_for_natural_speech(text, language):
     """Clean text for natural, native-like speech synthesis."""
 
     # Basic cleaning that works for all languages
     cleaned = text
 
-    # Remove markdown and formatting
-    cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)  # Bold
-    cleaned = re.sub(r'\*(.*?)\*', r'\1', cleaned)      # Italic
-    cleaned = re.sub(r'`(.*?)`', r'\1', cleaned)        # Code
-
-    # Handle common abbreviations by language
-    if language.startswith('en'):
-        cleaned = re.sub(r'\bDr\.', 'Doctor', cleaned)
-        cleaned = re.sub(r'\bMr\.', 'Mister', cleaned)
-        cleaned = re.sub(r'\bMrs\.', 'Missus', cleaned)
-        cleaned = re.sub(r'\betc\.', 'etcetera', cleaned)
-        cleaned = re.sub(r'\bAI\b', 'artificial intelligence', cleaned)
-        cleaned = re.sub(r'\bDNA\b', 'DNA', cleaned)  # Keep as-is, sounds better
-        cleaned = re.sub(r'\bCO2\b', 'carbon dioxide', cleaned)
+    # Remove markdown and formatting (each pass only runs if its marker occurs)
+    if '*' in cleaned:
+        cleaned = MARKDOWN_BOLD_RE.sub(r'\1', cleaned)
+        cleaned = MARKDOWN_ITALIC_RE.sub(r'\1', cleaned)
+    if '`' in cleaned:
+        cleaned = MARKDOWN_CODE_RE.sub(r'\1', cleaned)
+
+    # Expand common English abbreviations in a single pass
+    if (language.startswith('en') and
+            any(abbreviation in cleaned for abbreviation in EN_ABBREVIATIONS)):
+        cleaned = EN_ABBREVIATION_RE.sub(
+            lambda match: EN_ABBREVIATIONS[match.group(0)], cleaned
+        )
 
     # Add natural pauses (keep it simple)
-    cleaned = re.sub(r'([.!?])\s+', r'\1 ', cleaned)
-    cleaned = re.sub(r',\s*', ', ', cleaned)
-    cleaned = re.sub(r':\s*', ': ', cleaned)
+    if ',' in cleaned:
+        cleaned = COMMA_SPACING_RE.sub(', ', cleaned)
+    if ':' in cleaned:
+        cleaned = COLON_SPACING_RE.sub(': ', cleaned)
 
-    # Clean up spacing
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    # Clean up spacing (also leaves one space after sentence punctuation)
+    cleaned = WHITESPACE_RE.sub(' ', cleaned).strip()
 
     return cleaned
 
+LANGUAGE_NAMES = {
+    'en-US': 'American English',
+    'en-GB': 'British English',
+    'es-ES': 'Spanish (Spain)',
+    'es-MX': 'Spanish (Mexico)',
+    'fr-FR': 'French',
+    'de-DE': 'German',
+    'it-IT': 'Italian',
+    'pt-BR': 'Portuguese (Brazil)',
+    'pt-PT': 'Portuguese (Portugal)'
+}
+BROWSER_VOICES = {
+    'en-US': 'Google US English',
+}
+
 def get_language_name(language_code):
     """Get human-readable language name."""
-    names = {
-        'en-US': 'American English',
-        'en-GB': 'British English',
-        'es-ES': 'Spanish (Spain)',
-        'es-MX': 'Spanish (Mexico)',
-        'fr-FR': 'French',
-        'de-DE': 'German',
-        'it-IT': 'Italian',
-        'pt-BR': 'Portuguese (Brazil)',
-        'pt-PT': 'Portuguese (Portugal)'
-    }
-    return names.get(language_code, language_code)
+    return LANGUAGE_NAMES.get(language_code, language_code)
 
 def get_best_voice_for_language(language):
     """Return the most natural and appropriate voice name for English only."""
-    voice_mapping = {
-        'en-US': 'Google US English',
-    }
-    return voice_mapping.get(language, 'Google US English')
+    return BROWSER_VOICES.get(language, 'Google US English')
+
+AVAILABLE_VOICES_BODY = app.json.dumps({
+    "voice_recommendations": {
+        'en-US': {
+            'preferred': ['Google US English',
+                         'Microsoft Zira - English (United States)',
+                         'Alex', 'Samantha'],
+            'description': 'American English with natural intonation'
+        }
+    },
+    "tips": [
+        "Local/native voices provide the most natural speech",
+        "Google voices generally offer excellent quality",
+        "Slower speech rates improve comprehension",
+        "Proper text cleaning enhances naturalness"
+    ],
+    "message": "Optimized for natural, native-like speech (English only)"
+}).encode('utf-8')
 
 @app.route('/voice/available-voices', methods=['GET'])
 def get_available_voices():
     """Get information about optimal TTS voices for natural speech (English only)."""
-    try:
-        voice_recommendations = {
-            'en-US': {
-                'preferred': ['Google US English',
-                             'Microsoft Zira - English (United States)',
-                             'Alex', 'Samantha'],
-                'description': 'American English with natural intonation'
-            }
-        }
-        return jsonify({
-            "voice_recommendations": voice_recommendations,
-            "tips": [
-                "Local/native voices provide the most natural speech",
-                "Google voices generally offer excellent quality",
-                "Slower speech rates improve comprehension",
-                "Proper text cleaning enhances naturalness"
-            ],
-            "message": "Optimized for natural, native-like speech (English only)"
-        })
-    except Exception as e:  # Broad exception needed for error handling
-        logger.error("Error getting voice information: %s", e)
-        return jsonify({"error": str(e)}), 500
+    return static_json_response(AVAILABLE_VOICES_BODY)
+
+# The account's voice list rarely changes; refresh it at most every few minutes
+VOICES_TTL_SECONDS = 300.0
+VOICES_CACHE = {"voices": None, "by_id": {}, "expires": 0.0}
+
+def get_elevenlabs_voices_cached():
+    """Get (voices, voices_by_id) from ElevenLabs, reusing a recent result."""
+    now = time.monotonic()
+    if now >= VOICES_CACHE["expires"]:
+        if callable(voices):
+            all_voices = list(voices())
+        else:
+            all_voices = list(ELEVENLABS_CLIENT.voices.get_all().voices)
+        VOICES_CACHE["voices"] = all_voices
+        VOICES_CACHE["by_id"] = {voice.voice_id: voice for voice in all_voices}
+        VOICES_CACHE["expires"] = now + VOICES_TTL_SECONDS
+    return VOICES_CACHE["voices"], VOICES_CACHE["by_id"]
 
 @app.route('/voice/elevenlabs/status', methods=['GET'])
 def elevenlabs_status():
@@ -782,17 +1280,16 @@ def elevenlabs_status():
 
         # Test API connection by getting voice info
         try:
-            all_voices = voices()
+            all_voices, voices_by_id = get_elevenlabs_voices_cached()
             current_voice_info = None
 
-            for voice in all_voices:
-                if voice.voice_id == ELEVENLABS_VOICE_ID:
-                    current_voice_info = {
-                        "voice_id": voice.voice_id,
-                        "name": voice.name,
-                        "category": voice.category
-                    }
-                    break
+            voice = voices_by_id.get(ELEVENLABS_VOICE_ID)
+            if voice is not None:
+                current_voice_info = {
+                    "voice_id": voice.voice_id,
+                    "name": voice.name,
+                    "category": voice.category
+                }
 
             return jsonify({
                 "available": True,
@@ -817,12 +1314,12 @@ def get_elevenlabs_voices():
     """Get available ElevenLabs voices."""
     try:
         if not ELEVENLABS_AVAILABLE:
-            return jsonify({"error": "ElevenLabs not available"}), 503
+            return error_response("ElevenLabs not available", 503)
 
         if not os.getenv('ELEVENLABS_API_KEY'):
-            return jsonify({"error": "ElevenLabs API key not configured"}), 503
+            return error_response("ElevenLabs API key not configured", 503)
 
-        all_voices = voices()
+        all_voices, _ = get_elevenlabs_voices_cached()
 
         voice_list = []
         for voice in all_voices:
@@ -845,23 +1342,103 @@ def get_elevenlabs_voices():
         logger.error("Error getting ElevenLabs voices: %s", e)
         return jsonify({"error": str(e)}), 500
 
+# Rick-optimized settings for the REST text-to-speech endpoint
+RICK_VOICE_SETTINGS = {
+    "stability": 0.45,           # More expressive for Rick's manic style
+    "similarity_boost": 0.85,    # Keep it sounding like Rick
+    "style": 0.8,               # Add more personality
+    "use_speaker_boost": True    # Enhance voice clarity
+}
+
+def make_rick_tts_key(rick_text):
+    """Build the TTS cache key for Rick-style speech."""
+    return make_tts_key(
+        rick_text, RICK_VOICE_ID, ELEVENLABS_MODEL_ID, TTS_OUTPUT_FORMAT,
+        RICK_VOICE_SETTINGS
+    )
+
+def synthesize_rick_audio(rick_text):
+    """Synthesize Rick-style speech, returning (audio_bytes, error_msg) and caching the clip."""
+    cache_key = make_rick_tts_key(rick_text)
+    audio_bytes = TTS_CACHE.get(cache_key)
+    if audio_bytes is not None:
+        logger.info("[TTS] Cache hit for Rick voice_id: %s", RICK_VOICE_ID)
+        return audio_bytes, None
+
+    response = ELEVENLABS_SESSION.post(
+        f"https://api.elevenlabs.io/v1/text-to-speech/{RICK_VOICE_ID}",
+        params={"output_format": TTS_OUTPUT_FORMAT},
+        json={
+            "text": rick_text,
+            "model_id": ELEVENLABS_MODEL_ID,
+            "voice_settings": RICK_VOICE_SETTINGS
+        },
+        timeout=ELEVENLABS_TIMEOUT
+    )
+
+    if response.status_code != 200:
+        logger.error("ElevenLabs API error: %s - %s", response.status_code, response.text)
+        return None, "Failed to generate Rick TTS audio"
+
+    TTS_CACHE.add(cache_key, response.content)
+    return response.content, None
+
+def stream_rick_audio(rick_text):
+    """Start Rick-style synthesis, returning (chunk_iterator, error_msg).
+
+    Chunks are yielded as ElevenLabs produces them; the full clip is cached at the end.
+    """
+    cache_key = make_rick_tts_key(rick_text)
+    audio_bytes = TTS_CACHE.get(cache_key)
+    if audio_bytes is not None:
+        logger.info("[TTS] Cache hit for Rick voice_id: %s", RICK_VOICE_ID)
+        return iter((audio_bytes,)), None
+
+    response = ELEVENLABS_SESSION.post(
+        f"https://api.elevenlabs.io/v1/text-to-speech/{RICK_VOICE_ID}/stream",
+        params={"output_format": TTS_OUTPUT_FORMAT},
+        json={
+            "text": rick_text,
+            "model_id": ELEVENLABS_MODEL_ID,
+            "voice_settings": RICK_VOICE_SETTINGS
+        },
+        stream=True,
+        timeout=ELEVENLABS_TIMEOUT
+    )
+
+    if response.status_code != 200:
+        logger.error("ElevenLabs API error: %s - %s", response.status_code, response.text)
+        response.close()
+        return None, "Failed to generate Rick TTS audio"
+
+    def generate():
+        buffer = io.BytesIO()
+        with response:
+            for chunk in response.iter_content(chunk_size=4096):
+                if chunk:
+                    buffer.write(chunk)
+                    yield chunk
+        TTS_CACHE.add(cache_key, buffer.getvalue())
+
+    return generate(), None
+
 @app.route('/rick/tts', methods=['POST'])
 def rick_tts():
     """Generate Rick Sanchez style TTS using ElevenLabs with custom voice settings."""
     try:
         if not ELEVENLABS_AVAILABLE:
-            return jsonify({"error": "ElevenLabs not available"}), 503
+            return error_response("ElevenLabs not available", 503)
 
         if not ELEVENLABS_API_KEY:
-            return jsonify({"error": "ElevenLabs API key not configured"}), 503
+            return error_response("ElevenLabs API key not configured", 503)
 
         data = request.get_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return error_response("No JSON data provided", 400)
 
         text = data.get('text', '').strip()
         if not text:
-            return jsonify({"error": "Text is required"}), 400
+            return error_response("Text is required", 400)
 
         # Clean text for Rick-style speech (add some Rick-isms if not present)
         rick_text = clean_text_for_rick_speech(text)
@@ -869,31 +1446,18 @@ def rick_tts():
         # Use the custom Rick voice ID or fallback to default
         voice_id = RICK_VOICE_ID
 
-        # Make request to ElevenLabs API with Rick-optimized settings
-        response = requests.post(
-            f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-            headers={
-                "xi-api-key": ELEVENLABS_API_KEY,
-                "Content-Type": "application/json"
-            },
-            json={
-                "text": rick_text,
-                "voice_settings": {
-                    "stability": 0.45,           # More expressive for Rick's manic style
-                    "similarity_boost": 0.85,    # Keep it sounding like Rick
-                    "style": 0.8,               # Add more personality
-                    "use_speaker_boost": True    # Enhance voice clarity
-                }
-            },
-            timeout=10  # Set a timeout for the request
-        )
+        audio_bytes, error_msg = synthesize_rick_audio(rick_text)
+        if error_msg:
+            return error_response(error_msg, 500)
 
-        if response.status_code != 200:
-            logger.error("ElevenLabs API error: %s - %s", response.status_code, response.text)
-            return jsonify({"error": "Failed to generate Rick TTS audio"}), 500
+        if wants_binary_audio():
+            return Response(audio_bytes, mimetype='audio/mpeg', headers={
+                "X-TTS-Provider": "elevenlabs_rick",
+                "X-TTS-Voice": voice_id
+            })
 
-        # Return audio as base64 for easier handling
-        audio_base64 = base64.b64encode(response.content).decode('utf-8')
+        # Legacy clients get audio as base64 for easier handling
+        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
 
         return jsonify({
             "text": rick_text,
@@ -911,92 +1475,69 @@ def rick_tts():
 
 @app.route('/rick/tts/file', methods=['POST'])
 def rick_tts_file():
-    """Generate Rick Sanchez style TTS and return as audio file."""
+    """Generate Rick Sanchez style TTS and stream it back as an audio file download."""
     try:
         if not ELEVENLABS_AVAILABLE:
-            return jsonify({"error": "ElevenLabs not available"}), 503
+            return error_response("ElevenLabs not available", 503)
 
         if not ELEVENLABS_API_KEY:
-            return jsonify({"error": "ElevenLabs API key not configured"}), 503
+            return error_response("ElevenLabs API key not configured", 503)
 
         data = request.get_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return error_response("No JSON data provided", 400)
 
         text = data.get('text', '').strip()
         if not text:
-            return jsonify({"error": "Text is required"}), 400
+            return error_response("Text is required", 400)
 
         # Clean text for Rick-style speech
         rick_text = clean_text_for_rick_speech(text)
 
-        # Use the custom Rick voice ID or fallback to default
-        voice_id = RICK_VOICE_ID
-
-        # Make request to ElevenLabs API
-        response = requests.post(
-            f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-            headers={
-                "xi-api-key": ELEVENLABS_API_KEY,
-                "Content-Type": "application/json"
-            },
-            json={
-                "text": rick_text,
-                "voice_settings": {
-                    "stability": 0.45,           # More expressive
-                    "similarity_boost": 0.85,    # More like Rick
-                    "style": 0.8,               # Add personality
-                    "use_speaker_boost": True
-                }
-            },
-            timeout=10  # Set a timeout for the request
-        )
+        audio_stream, error_msg = stream_rick_audio(rick_text)
+        if error_msg:
+            return error_response(error_msg, 500)
 
-        if response.status_code != 200:
-            logger.error("ElevenLabs API error: %s - %s", response.status_code, response.text)
-            return jsonify({"error": "Failed to generate Rick TTS audio"}), 500
-
-        # Save audio to temporary file
-        with NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-            temp_audio.write(response.content)
-            temp_audio.flush()
-            temp_audio.close()
-            return send_file(
-                temp_audio.name,
-                mimetype="audio/mpeg",
-                as_attachment=True,
-                download_name=f"rick_tts_{uuid.uuid4().hex[:8]}.mp3"
-            )
+        filename = f"rick_tts_{uuid.uuid4().hex[:8]}.mp3"
+        return Response(audio_stream, mimetype="audio/mpeg", headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        })
 
     except Exception as e:  # Broad exception needed for error handling
         logger.error("Error in Rick TTS file: %s", e)
         return jsonify({"error": str(e)}), 500
 
+# Whitespace runs, or the words Rick likes to repeat
+RICK_SPEECH_RE = re.compile(r'(\s+)|\b(very|really)\b')
+
 def clean_text_for_rick_speech(text):
     """Clean and enhance text for Rick Sanchez style speech."""
 
     rick_text = text
 
-    # Remove markdown formatting
-    rick_text = re.sub(r'\*\*(.*?)\*\*', r'\1', rick_text)
-    rick_text = re.sub(r'\*(.*?)\*', r'\1', rick_text)
-    rick_text = re.sub(r'`(.*?)`', r'\1', rick_text)
-
-    # Add Rick-style speech patterns (but don't overdo it)
-    rick_text = rick_text.replace('very', 'very very')
-    rick_text = rick_text.replace('really', 'really really')
+    # Remove markdown formatting (each pass only runs if its marker occurs)
+    if '*' in rick_text:
+        rick_text = MARKDOWN_BOLD_RE.sub(r'\1', rick_text)
+        rick_text = MARKDOWN_ITALIC_RE.sub(r'\1', rick_text)
+    if '`' in rick_text:
+        rick_text = MARKDOWN_CODE_RE.sub(r'\1', rick_text)
 
-    # Clean up spacing
-    rick_text = re.sub(r'\s+', ' ', rick_text).strip()
+    # Add Rick-style speech patterns (but don't overdo it) and clean up
+    # spacing in a single pass
+    rick_text = RICK_SPEECH_RE.sub(
+        lambda match: ' ' if match.group(1) else f"{match.group(2)} {match.group(2)}",
+        rick_text
+    ).strip()
 
     # Add some Rick-style interjections occasionally (sparingly)
     if len(rick_text) > 100 and 'you know' not in rick_text.lower():
-        sentences = rick_text.split('.')
-        if len(sentences) > 2:
-            # Insert a casual interjection in the middle
-            mid_point = len(sentences) // 2
-            sentences[mid_point] = sentences[mid_point] + ', you know'
-            rick_text = '.'.join(sentences)
+        period_count = rick_text.count('.')
+        if period_count >= 2:
+            # Insert a casual interjection before the middle period
+            pos = -1
+            for _ in range((period_count + 1) // 2 + 1):
+                pos = rick_text.find('.', pos + 1)
+            rick_text = rick_text[:pos] + ', you know' + rick_text[pos:]
 
     return rick_text
 
@@ -1021,17 +1562,16 @@ def rick_tts_status():
 
         # Test API connection and get voice info
         try:
-            all_voices = voices()
+            _, voices_by_id = get_elevenlabs_voices_cached()
             rick_voice_info = None
 
-            for voice in all_voices:
-                if voice.voice_id == RICK_VOICE_ID:
-                    rick_voice_info = {
-                        "voice_id": voice.voice_id,
-                        "name": voice.name,
-                        "category": voice.category
-                    }
-                    break
+            voice = voices_by_id.get(RICK_VOICE_ID)
+            if voice is not None:
+                rick_voice_info = {
+                    "voice_id": voice.voice_id,
+                    "name": voice.name,
+                    "category": voice.category
+                }
 
             status_text = ("Rick TTS ready!" if rick_voice_info
                           else "Rick voice ID not found in available voices")
@@ -1083,9 +1623,10 @@ if __name__ == '__main__':
     logger.info("🚀 Starting Kurzgesagt RAG Web Interface...")
     logger.info("🌐 Open your browser to: http://localhost:5000")
 
+    # Debug mode (and its reloader, which imports the app twice) is opt-in
     app.run(
         host='0.0.0.0',
         port=5000,
-        debug=True,
+        debug=os.getenv('FLASK_ENV') == 'development',
         threaded=True
     )
@@ -0,0 +1,17 @@
+"""
+ASGI entry point for the Kurzgesagt RAG Chatbot.
+Exposes the Flask app to ASGI servers such as Uvicorn:
+
+    uvicorn asgi:app --workers 4
+
+Requests are dispatched to a thread pool, so the event loop stays free
+while the RAG agent waits on OpenAI, Pinecone or ElevenLabs.
+"""
+
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app
+
+app = WSGIMiddleware(flask_app, workers=int(os.getenv('ASGI_THREADS', '16')))
@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for the Kurzgesagt RAG Chatbot.
+Launch with: gunicorn -c gunicorn.conf.py asgi:app
+or, with threaded WSGI workers: GUNICORN_WORKER_CLASS=gthread gunicorn -c gunicorn.conf.py app:app
+or, with green-thread workers: GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', str(2 * multiprocessing.cpu_count() + 1)))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+# Request threads per worker for the gthread class (Uvicorn workers use ASGI_THREADS).
+# RAG and TTS handlers mostly wait on OpenAI, Pinecone and ElevenLabs, so threads
+# overlap that I/O without the memory of extra worker processes.
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+# Concurrent green threads per worker for the gevent/eventlet classes.
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+timeout = 60
+
+# Import the app (LangChain, OpenAI, Pinecone modules) once in the master
+# and share it with the workers via copy-on-write; the RAG agent itself is
+# per-worker state and is only built in post_worker_init. Green-thread workers
+# monkey-patch sockets and ssl on startup, which must happen before the app
+# imports them, so those workers load the app themselves.
+preload_app = worker_class not in ('gevent', 'eventlet')
+# Don't build the RAG agent on import; post_worker_init builds one per worker
+os.environ['RAG_AGENT_INIT_IN_WORKER'] = '1'
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    """Give each preloaded worker its own log thread (threads don't survive fork)."""
+    if not server.cfg.preload_app:
+        return
+    import app  # pylint: disable=import-outside-toplevel
+    app.start_log_listener()
+
+
+def post_worker_init(worker):  # pylint: disable=unused-argument
+    """Build and warm up this worker's RAG agent once the app is loaded."""
+    import app  # pylint: disable=import-outside-toplevel
+    app.RAG_AGENT = app.init_rag_agent()
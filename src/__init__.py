@@ -5,17 +5,35 @@ __version__ = "1.0.0"
 __author__ = "Kurzgesagt RAG Team"
 
 # Import main components for easy access
-from .kurzgesagt_rag_agent import KurzgesagtRAGAgent
 from .context_retriever import retrieve_context, format_context
-from .language_utils import detect_language_and_translate
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache
 from .semantic_cache import SemanticCache
 from .simple_conversation_memory import SimpleConversationMemory
+from .redis_conversation_memory import RedisConversationMemory
+from .tts_cache import TTSCache
 
 __all__ = [
     'KurzgesagtRAGAgent',
+    'RagResult',
     'retrieve_context', 
     'format_context',
-    'detect_language_and_translate',
+    'EmbeddingBatcher',
+    'EmbeddingCache',
     'SemanticCache',
-    'SimpleConversationMemory'
+    'SimpleConversationMemory',
+    'RedisConversationMemory',
+    'TTSCache'
 ]
+
+# The agent pulls in LangChain (over a second of imports), so it is loaded on
+# first access instead of whenever any src.* module is imported.
+LAZY_EXPORTS = {'KurzgesagtRAGAgent', 'RagResult'}
+
+
+def __getattr__(name):
+    """Import the agent module the first time one of its names is requested."""
+    if name in LAZY_EXPORTS:
+        from . import kurzgesagt_rag_agent  # pylint: disable=import-outside-toplevel
+        return getattr(kurzgesagt_rag_agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,68 @@
+"""
+Answer Stream Module
+Extracts the "answer" field from a JSON response while it is still streaming,
+so the answer text can be shown before the model finishes.
+"""
+
+import re
+
+ANSWER_FIELD_RE = re.compile(r'"answer"\s*:\s*"')
+JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b',
+                'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class AnswerStreamExtractor:
+    """
+    Incrementally decodes the "answer" string of a streamed JSON object.
+    feed() returns only the newly decoded answer text for each chunk.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = None
+        self.done = False
+
+    def feed(self, chunk):
+        """Add a streamed chunk and return any new answer text."""
+        if self.done:
+            return ""
+        self._buffer += chunk
+        if self._pos is None:
+            match = ANSWER_FIELD_RE.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+        decoded = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self.done = True
+                break
+            if char != '\\':
+                decoded.append(char)
+                pos += 1
+                continue
+            # Escape sequence: wait for the rest of it if it is split across chunks
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape == 'u':
+                if pos + 6 > len(buffer):
+                    break
+                code = int(buffer[pos + 2:pos + 6], 16)
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: combine with the following \uXXXX low surrogate
+                    if pos + 12 > len(buffer):
+                        break
+                    low = int(buffer[pos + 8:pos + 12], 16)
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    pos += 6
+                decoded.append(chr(code))
+                pos += 6
+            else:
+                decoded.append(JSON_ESCAPES.get(escape, escape))
+                pos += 2
+        self._pos = pos
+        return "".join(decoded)
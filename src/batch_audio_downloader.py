@@ -3,38 +3,83 @@ Batch YouTube Audio Downloader and Transcriber
 Downloads audio from YouTube videos and optionally transcribes them using Whisper.
 """
 
-import os
+import functools
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import whisper
 import yt_dlp
 
+# faster-whisper (CTranslate2, int8) is preferred when installed
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
 DEFAULT_OUTPUT_DIR = "audio_files"
 DEFAULT_TRANSCRIPTS_DIR = "transcripts"
 DEFAULT_VIDEO_FILE = "video_selection.txt"
 DEFAULT_MODEL_SIZE = "small"
+DEFAULT_DOWNLOAD_WORKERS = 4
+# Token bucket: downloads start at this average rate, with short bursts allowed
+DOWNLOAD_RATE_PER_SECOND = 1.0
+DOWNLOAD_BURST = DEFAULT_DOWNLOAD_WORKERS
 DEFAULT_CATEGORIES = [
     "Black Holes", "Climate change", "Aliens", "Drugs",
     "Dinosaurs", "Immune system", "What if scenarios"
 ]
+VIDEO_LINE_RE = re.compile(r'- (https://www\.youtube\.com/watch\?v=[^&\s]+).*?--> (.+)')
+TITLE_UNSAFE_RE = re.compile(r'[^\w\s-]')
+TITLE_SEPARATOR_RE = re.compile(r'[-\s]+')
+
+class DownloadRateLimiter:
+    """Thread-safe token bucket that paces download starts."""
+
+    def __init__(self, rate: float = DOWNLOAD_RATE_PER_SECOND, burst: int = DOWNLOAD_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def clean_video_title(title: str) -> str:
+    """Turn a video title into a filename-safe, underscore-separated name."""
+    clean_title = TITLE_UNSAFE_RE.sub('', title.strip()).strip()
+    return TITLE_SEPARATOR_RE.sub('_', clean_title)
 
 def extract_urls_from_file(file_path: str) -> Tuple[List[str], List[str]]:
     """Extract YouTube URLs and titles from the video selection file."""
     urls = []
     titles = []
+    # Entries never span lines, so stream the file instead of reading it whole
     with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    pattern = r'- (https://www\.youtube\.com/watch\?v=[^&\s]+).*?--> (.+)'
-    matches = re.findall(pattern, content)
-    for url, title in matches:
-        clean_url = url.split('&list=')[0]
-        urls.append(clean_url)
-        clean_title = re.sub(r'[^\w\s-]', '', title.strip()).strip()
-        clean_title = re.sub(r'[-\s]+', '_', clean_title)
-        titles.append(clean_title)
+        for line in f:
+            match = VIDEO_LINE_RE.search(line)
+            if match is None:
+                continue
+            url, title = match.groups()
+            urls.append(url.split('&list=')[0])
+            titles.append(clean_video_title(title))
     return urls, titles
 
 def download_audio(video_url: str, output_dir: str, filename: str) -> bool:
@@ -65,23 +110,57 @@ def download_audio(video_url: str, output_dir: str, filename: str) -> bool:
         print(f"✗ Unexpected error downloading {filename}: {str(e)}")
         return False
 
+@functools.lru_cache(maxsize=2)
+def get_whisper_model(model_size: str = DEFAULT_MODEL_SIZE):
+    """Load a Whisper model once per size and reuse it for every file."""
+    if WhisperModel is not None:
+        return WhisperModel(model_size, device="auto", compute_type="int8")
+    if whisper is None:
+        raise ImportError("Install faster-whisper or openai-whisper to transcribe audio")
+    return whisper.load_model(model_size)
+
 def transcribe_audio_whisper_local(audio_path: str, model_size: str = DEFAULT_MODEL_SIZE) -> Optional[str]:
     """Transcribe audio using Whisper."""
     try:
-        model = whisper.load_model(model_size)
+        model = get_whisper_model(model_size)
+        if WhisperModel is not None:
+            # Voice activity detection skips silent stretches
+            segments, _ = model.transcribe(audio_path, vad_filter=True)
+            return "".join(segment.text for segment in segments)
         result = model.transcribe(audio_path)
         return result["text"]
     except Exception as e:
         print(f"Error transcribing {audio_path}: {str(e)}")
         return None
 
+def transcribe_to_file(
+    title: str, output_dir: str, transcripts_dir: str, model_size: str
+) -> None:
+    """Transcribe a downloaded audio file unless its transcript already exists."""
+    audio_file_path = str(Path(output_dir) / f"{title}.mp3")
+    transcript_file_path = str(Path(transcripts_dir) / f"{title}_transcript.txt")
+    if Path(transcript_file_path).exists():
+        print(f"Transcript already exists: {title}_transcript.txt")
+        return
+    print(f"Transcribing: {title}...")
+    transcript = transcribe_audio_whisper_local(audio_file_path, model_size)
+    if transcript:
+        with open(transcript_file_path, "w", encoding="utf-8") as f:
+            f.write(transcript)
+        print(f"✓ Transcript saved: {title}_transcript.txt")
+
 def batch_download_and_transcribe(
     video_file_path: str,
     output_dir: str = DEFAULT_OUTPUT_DIR,
     transcripts_dir: str = DEFAULT_TRANSCRIPTS_DIR,
-    model_size: str = DEFAULT_MODEL_SIZE
+    model_size: str = DEFAULT_MODEL_SIZE,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS
 ) -> None:
-    """Download audio from multiple videos and optionally transcribe them."""
+    """Download audio from multiple videos and optionally transcribe them.
+
+    Downloads run in a thread pool while finished files are transcribed,
+    so network and Whisper work overlap.
+    """
     Path(output_dir).mkdir(exist_ok=True)
     Path(transcripts_dir).mkdir(exist_ok=True)
     urls, titles = extract_urls_from_file(video_file_path)
@@ -89,29 +168,32 @@ def batch_download_and_transcribe(
     print("-" * 50)
     successful_downloads = 0
     failed_downloads = 0
-    for idx, (url, title) in enumerate(zip(urls, titles), 1):
-        print(f"\n[{idx}/{len(urls)}] Processing: {title}")
-        audio_file_path = str(Path(output_dir) / f"{title}.mp3")
-        if Path(audio_file_path).exists():
-            print(f"Audio file already exists: {title}.mp3")
-        else:
-            success = download_audio(url, output_dir, title)
-            if success:
-                successful_downloads += 1
+    limiter = DownloadRateLimiter()
+
+    def polite_download(url: str, title: str) -> bool:
+        """Download one video once the rate limiter allows it."""
+        limiter.acquire()
+        return download_audio(url, output_dir, title)
+
+    with ThreadPoolExecutor(max_workers=download_workers) as pool:
+        pending = {}
+        already_downloaded = []
+        for idx, (url, title) in enumerate(zip(urls, titles), 1):
+            print(f"\n[{idx}/{len(urls)}] Processing: {title}")
+            if (Path(output_dir) / f"{title}.mp3").exists():
+                print(f"Audio file already exists: {title}.mp3")
+                already_downloaded.append(title)
             else:
+                pending[pool.submit(polite_download, url, title)] = title
+        for title in already_downloaded:
+            transcribe_to_file(title, output_dir, transcripts_dir, model_size)
+        for future in as_completed(pending):
+            title = pending[future]
+            if not future.result():
                 failed_downloads += 1
                 continue
-        transcript_file_path = str(Path(transcripts_dir) / f"{title}_transcript.txt")
-        if not Path(transcript_file_path).exists():
-            print(f"Transcribing: {title}...")
-            transcript = transcribe_audio_whisper_local(audio_file_path, model_size)
-            if transcript:
-                with open(transcript_file_path, "w", encoding="utf-8") as f:
-                    f.write(transcript)
-                print(f"✓ Transcript saved: {title}_transcript.txt")
-        else:
-            print(f"Transcript already exists: {title}_transcript.txt")
-        time.sleep(1)
+            successful_downloads += 1
+            transcribe_to_file(title, output_dir, transcripts_dir, model_size)
     print("\n" + "=" * 50)
     print("Download Summary:")
     print(f"✓ Successful downloads: {successful_downloads}")
@@ -122,7 +204,8 @@ def batch_download_and_transcribe(
 def download_specific_categories(
     video_file_path: str,
     categories: Optional[List[str]] = None,
-    output_dir: str = DEFAULT_OUTPUT_DIR
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS
 ) -> None:
     """Download audio only from specific categories."""
     Path(output_dir).mkdir(exist_ok=True)
@@ -130,23 +213,28 @@ def download_specific_categories(
         content = f.read()
     if categories is None:
         categories = DEFAULT_CATEGORIES
-    for category in categories:
-        print(f"\n--- Processing category: {category} ---")
-        category_pattern = rf'{re.escape(category)}:(.*?)(?=\n\d+\.|$)'
-        category_match = re.search(category_pattern, content, re.DOTALL)
-        if not category_match:
-            print(f"Category '{category}' not found")
-            continue
-        category_content = category_match.group(1)
-        pattern = r'- (https://www\.youtube\.com/watch\?v=[^&\s]+).*?--> (.+)'
-        matches = re.findall(pattern, category_content)
-        for url, title in matches:
-            clean_url = url.split('&list=')[0]
-            clean_title = re.sub(r'[^\w\s-]', '', title.strip()).strip()
-            clean_title = re.sub(r'[-\s]+', '_', clean_title)
-            filename = f"{category.replace(' ', '_')}_{clean_title}"
-            download_audio(clean_url, output_dir, filename)
-            time.sleep(1)
+    limiter = DownloadRateLimiter()
+
+    def polite_download(url: str, filename: str) -> bool:
+        """Download one video once the rate limiter allows it."""
+        limiter.acquire()
+        return download_audio(url, output_dir, filename)
+
+    with ThreadPoolExecutor(max_workers=download_workers) as pool:
+        for category in categories:
+            print(f"\n--- Processing category: {category} ---")
+            category_pattern = rf'{re.escape(category)}:(.*?)(?=\n\d+\.|$)'
+            category_match = re.search(category_pattern, content, re.DOTALL)
+            if not category_match:
+                print(f"Category '{category}' not found")
+                continue
+            category_content = category_match.group(1)
+            matches = VIDEO_LINE_RE.findall(category_content)
+            for url, title in matches:
+                clean_url = url.split('&list=')[0]
+                clean_title = clean_video_title(title)
+                filename = f"{category.replace(' ', '_')}_{clean_title}"
+                pool.submit(polite_download, clean_url, filename)
 
 def main():
     """Main entry point for the batch audio downloader CLI."""
@@ -3,31 +3,38 @@ Context Retriever Module
 Handles context retrieval and formatting for the Kurzgesagt RAG Agent.
 """
 
+import os
+from itertools import islice, takewhile
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
-def cosine_similarity_simple(vec1: List[float], vec2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors."""
-    a = np.array(vec1)
-    b = np.array(vec2)
-    dot_product = np.dot(a, b)
-    magnitude_a = np.linalg.norm(a)
-    magnitude_b = np.linalg.norm(b)
-    if magnitude_a == 0 or magnitude_b == 0:
-        return 0.0
-    return float(dot_product / (magnitude_a * magnitude_b))
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
 
-def get_query_embedding(query: str, openai_client: Any) -> Optional[List[float]]:
-    """Generate embedding for a query using the OpenAI client."""
+def get_embedding_model() -> str:
+    """Return the query embedding model; it must match the model the index was built with."""
+    return os.getenv("OPENAI_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+
+def get_query_embeddings(queries: List[str], openai_client: Any) -> Optional[np.ndarray]:
+    """Embed several queries in one API call, returning a float32 (N, dim) array."""
+    if not queries:
+        return None
     try:
-        query_response = openai_client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=[query]
+        response = openai_client.embeddings.create(
+            model=get_embedding_model(),
+            input=list(queries)
         )
-        return query_response.data[0].embedding
     except Exception as e:
         print(f"❌ Embedding error: {e}")
         return None
+    ordered = sorted(response.data, key=lambda item: item.index)
+    return np.asarray([item.embedding for item in ordered], dtype=np.float32)
+
+def get_query_embedding(query: str, openai_client: Any) -> Optional[List[float]]:
+    """Generate embedding for a query using the OpenAI client."""
+    embeddings = get_query_embeddings([query], openai_client)
+    if embeddings is None:
+        return None
+    return embeddings[0].tolist()
 
 def find_similar_cached_query(
     query: str,
@@ -38,35 +45,57 @@ def find_similar_cached_query(
     """Find a similar query in cache using semantic similarity."""
     if not cache:
         return None, None
+    cached_queries = [
+        cached_query for cached_query, cached_data in cache.items()
+        if isinstance(cached_data, dict) and 'embedding' in cached_data
+    ]
+    if not cached_queries:
+        return None, None
     query_embedding = get_query_embedding(query, openai_client)
     if query_embedding is None:
         return None, None
-    best_match = None
-    best_similarity = 0.0
-    for cached_query, cached_data in cache.items():
-        if isinstance(cached_data, dict) and 'embedding' in cached_data:
-            cached_embedding = cached_data['embedding']
-            similarity = cosine_similarity_simple(query_embedding, cached_embedding)
-            print(f"🔍 Similarity with '{cached_query[:50]}...': {similarity:.3f}")
-            if similarity > best_similarity and similarity >= similarity_threshold:
-                best_similarity = similarity
-                best_match = (cached_query, cached_data['results'])
-    if best_match:
-        cached_query, results = best_match
+    # Score every cached embedding against the query in a single matrix-vector product
+    matrix = np.asarray(
+        [cache[cached_query]['embedding'] for cached_query in cached_queries],
+        dtype=np.float32
+    )
+    query_vector = np.asarray(query_embedding, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vector)
+    similarities = np.divide(
+        matrix @ query_vector, norms,
+        out=np.zeros(len(cached_queries), dtype=np.float32), where=norms > 0
+    )
+    best_index = int(similarities.argmax())
+    best_similarity = float(similarities[best_index])
+    if best_similarity >= similarity_threshold:
+        cached_query = cached_queries[best_index]
         print(f"🎯 Found similar cached query: '{cached_query[:50]}...' (similarity: {best_similarity:.3f})")
-        return cached_query, results
+        return cached_query, cache[cached_query]['results']
     return None, None
 
+# Matches scoring below this cosine similarity are not used as context
+MIN_MATCH_SCORE = 0.75
+
+def filter_matches(matches: List[Any], top_k: int) -> List[Any]:
+    """Keep the top_k matches that clear MIN_MATCH_SCORE."""
+    # Pinecone cannot filter on score server-side, but it returns matches
+    # sorted by descending score, so stop at the first one below threshold
+    return list(islice(
+        takewhile(lambda match: match.score >= MIN_MATCH_SCORE, matches), top_k
+    ))
+
 def retrieve_context(
     index: Any,
     query: str,
     openai_client: Any,
-    top_k: int = 3
+    top_k: int = 3,
+    query_embedding: Optional[List[float]] = None
 ) -> List[Any]:
-    """Retrieve relevant context from Pinecone."""
+    """Retrieve relevant context from Pinecone, reusing query_embedding if given."""
     try:
         print("🚀 Performing Pinecone search...")
-        query_embedding = get_query_embedding(query, openai_client)
+        if query_embedding is None:
+            query_embedding = get_query_embedding(query, openai_client)
         if query_embedding is None:
             return []
         results = index.query(
@@ -74,28 +103,28 @@ def retrieve_context(
             top_k=top_k,
             include_metadata=True
         )
-        filtered_matches = [
-            match for match in results.matches
-            if match.score >= 0.75
-        ][:top_k]
-        return filtered_matches
+        return filter_matches(results.matches, top_k)
     except Exception as e:
         print(f"❌ Retrieval error: {e}")
         return []
 
+CONTEXT_TEMPLATE = (
+    "Context %d (Relevance: %.3f):\n"
+    "Video Title: %s\n"
+    "Content Snippet: %s..."
+)
+
 def format_context(matches: List[Any]) -> str:
     """Format retrieved context for the LLM with improved clarity."""
     if not matches:
         return "No relevant context found."
-    context_parts = []
-    for i, match in enumerate(matches, 1):
-        video_title = match.metadata.get('video_title', 'Unknown')
-        text = match.metadata.get('text', 'No content available')
-        score = match.score
-        context_part = (
-            f"Context {i} (Relevance: {score:.3f}):\n"
-            f"Video Title: {video_title}\n"
-            f"Content Snippet: {text[:200]}...  # Limit snippet length for clarity"
+    # Snippets are limited to 200 characters for clarity
+    return "\n\n".join(
+        CONTEXT_TEMPLATE % (
+            i,
+            match.score,
+            match.metadata.get('video_title', 'Unknown'),
+            match.metadata.get('text', 'No content available')[:200],
         )
-        context_parts.append(context_part)
-    return "\n\n".join(context_parts)
+        for i, match in enumerate(matches, 1)
+    )
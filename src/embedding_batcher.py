@@ -0,0 +1,85 @@
+"""
+Embedding Batcher Module
+Collects concurrent embedding requests and sends them to OpenAI as one batch.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batches embedding requests coming from concurrent request threads.
+    Callers block on a future while a worker thread groups pending texts
+    into a single embeddings API call.
+    """
+
+    def __init__(self, openai_client, model="text-embedding-ada-002",
+                 max_batch=16, max_wait_ms=10):
+        self.openai_client = openai_client
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use (and again after a fork)."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def embed(self, text, timeout=30):
+        """Return the embedding for text, batched with concurrent callers."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future.result(timeout=timeout)
+
+    def embed_many(self, texts, timeout=30):
+        """Return embeddings for several texts, queued together so they share a batch."""
+        futures = [Future() for _ in texts]
+        self._ensure_worker()
+        for text, future in zip(texts, futures):
+            self._queue.put((text, future))
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _collect_batch(self):
+        """Wait for one request, then gather more until the batch is full or time runs out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop: embed each collected batch and resolve its futures."""
+        while True:
+            batch = self._collect_batch()
+            try:
+                response = self.openai_client.embeddings.create(
+                    model=self.model,
+                    input=[text for text, _ in batch]
+                )
+                embeddings = [
+                    item.embedding
+                    for item in sorted(response.data, key=lambda item: item.index)
+                ]
+            except Exception as e:  # pylint: disable=broad-except
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
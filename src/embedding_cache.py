@@ -0,0 +1,105 @@
+"""
+Embedding Cache Module
+LRU cache for query embeddings, optionally backed by Redis so that
+all workers share vectors. Redis copies are stored as float16 bytes.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from .semantic_cache import normalize_query
+
+
+class EmbeddingCache:
+    """
+    In-process LRU of normalized text -> embedding, with an optional Redis tier.
+    Redis errors are treated as misses so the embedder remains the fallback.
+    """
+
+    def __init__(self, maxsize=4096, redis_client=None, redis_ttl_seconds=86400,
+                 model=""):
+        self._cache = OrderedDict()
+        self.model = model
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.redis_client = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_key(self, key):
+        """Build the Redis key for a normalized text (and the model that embedded it)."""
+        material = f"{self.model}|{key}".encode("utf-8")
+        return "emb:" + hashlib.blake2b(material, digest_size=16).hexdigest()
+
+    def get(self, text):
+        """Return the cached embedding for text or None."""
+        key = normalize_query(text)
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return embedding
+        embedding = self._get_from_redis(key)
+        with self._lock:
+            if embedding is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._store_local(key, embedding)
+        return embedding
+
+    def add(self, text, embedding):
+        """Store an embedding locally and, if configured, in Redis."""
+        key = normalize_query(text)
+        self._store_local(key, embedding)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.setex(
+                    self._redis_key(key),
+                    self.redis_ttl_seconds,
+                    np.asarray(embedding, dtype=np.float16).tobytes()
+                )
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    def _get_from_redis(self, key):
+        """Fetch and decode a float16 embedding from Redis."""
+        if self.redis_client is None:
+            return None
+        try:
+            data = self.redis_client.get(self._redis_key(key))
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if data is None:
+            return None
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+
+    def _store_local(self, key, embedding):
+        """Insert into the in-process LRU, evicting the oldest entry when full."""
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        """Clear the in-process cache."""
+        with self._lock:
+            self._cache.clear()
+
+    def size(self):
+        """Get the number of embeddings cached in-process."""
+        return len(self._cache)
+
+    def get_stats(self):
+        """Get cache statistics as a dictionary."""
+        return {
+            "total_embeddings": len(self._cache),
+            "max_size": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_enabled": self.redis_client is not None,
+        }
@@ -3,6 +3,37 @@ Interactive Modes Module
 Handles interactive and demo modes for the Kurzgesagt RAG Agent.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+
+def print_token(text):
+    """Print streamed answer text as soon as it arrives."""
+    print(text, end='', flush=True)
+
+
+def stream_answer(rag_agent, question, session_id="default", mode="normal"):
+    """Answer a question, printing the answer as it streams; returns (result, streamed)."""
+    streamed = []
+
+    def on_token(text):
+        streamed.append(text)
+        print_token(text)
+
+    result = rag_agent.generate_answer(question, session_id, mode=mode, on_token=on_token)
+    print()
+    return result, bool(streamed)
+
+
+def display_answer_with_sources(result, label="🤖 Answer", answer_streamed=False):
+    """Print a RagResult's answer (unless already streamed), language and source videos."""
+    answer_data = result.answer
+    if not answer_streamed:
+        print(f"\n{label}: {answer_data['answer']}")
+    print(f"\n🌍 Language: {result.language} | Confidence: {answer_data['confidence']}")
+    for match in result.matches:
+        print(f"📚 {match.metadata.get('video_title', 'Unknown')} (relevance {match.score:.2f})")
+
+
 def interactive_rag_chat(rag_agent):
     """Interactive RAG chat interface with multilingual support."""
     print("\n💬 Interactive Multilingual RAG Chat Mode")
@@ -20,15 +51,9 @@ def interactive_rag_chat(rag_agent):
             continue
         if not question:
             continue
-        result = rag_agent.generate_answer(question)
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer_data, matches, language = result
-            rag_agent.display_answer_with_sources(question, answer_data, matches, language)
-        elif isinstance(result, tuple):
-            answer_data, matches = result
-            rag_agent.display_answer_with_sources(question, answer_data, matches)
-        else:
-            print(f"\n🤖 Answer: {result}")
+        print("\n🤖 ", end='', flush=True)
+        result, streamed = stream_answer(rag_agent, question)
+        display_answer_with_sources(result, answer_streamed=streamed)
 
 def show_multilingual_examples():
     """Show example questions in multiple languages."""
@@ -61,18 +86,17 @@ def quick_demo(rag_agent):
     ]
     print("\n🚀 Quick Multilingual RAG Demo")
     print("=" * 40)
-    for lang, question in demo_questions:
+    # The questions are independent, so answer them concurrently (one session each)
+    with ThreadPoolExecutor(max_workers=len(demo_questions)) as pool:
+        futures = [
+            pool.submit(rag_agent.generate_answer, question, f"demo_{lang.lower()}")
+            for lang, question in demo_questions
+        ]
+    for (lang, question), future in zip(demo_questions, futures):
         print(f"\n{'='*70}")
         print(f"🌍 Testing with {lang} question...")
-        result = rag_agent.generate_answer(question)
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer, matches, detected_lang = result
-            rag_agent.display_answer_with_sources(question, answer, matches, detected_lang)
-        elif isinstance(result, tuple):
-            answer, matches = result
-            rag_agent.display_answer_with_sources(question, answer, matches)
-        else:
-            print(f"\n🤖 Answer: {result}")
+        print(f"❓ {question}")
+        display_answer_with_sources(future.result())
         input("\nPress Enter to continue to next question...")
     print("\n🎉 Demo completed! The system can handle questions in multiple languages!")
     print("🌍 Try asking questions in your preferred language!")
@@ -106,15 +130,11 @@ def rick_sanchez_chat(rag_agent):
         if not question:
             print("🧪 *burp* Come on Morty, ask me something! Don't waste my time!")
             continue
-        result = rag_agent.generate_answer(question, session_id, mode="crazy_scientist")
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer_data, matches, language = result
-            rag_agent.display_answer_with_sources(question, answer_data, matches, language)
-        elif isinstance(result, tuple):
-            answer_data, matches = result
-            rag_agent.display_answer_with_sources(question, answer_data, matches)
-        else:
-            print(f"\n🧪 Rick says: {result}")
+        print("\n🧪 ", end='', flush=True)
+        result, streamed = stream_answer(
+            rag_agent, question, session_id, mode="crazy_scientist"
+        )
+        display_answer_with_sources(result, "🧪 Rick says", answer_streamed=streamed)
 
 def crazy_scientist_demo(rag_agent):
     """Demo of Rick Sanchez mode with science questions."""
@@ -131,13 +151,6 @@ def crazy_scientist_demo(rag_agent):
         print(f"\n{'='*70}")
         print(f"🧪 Rick tackles: {question}")
         result = rag_agent.generate_answer(question, session_id, mode="crazy_scientist")
-        if isinstance(result, tuple) and len(result) >= 3:
-            answer, matches, detected_lang = result
-            rag_agent.display_answer_with_sources(question, answer, matches, detected_lang)
-        elif isinstance(result, tuple):
-            answer, matches = result
-            rag_agent.display_answer_with_sources(question, answer, matches)
-        else:
-            print(f"\n🧪 Rick says: {result}")
+        display_answer_with_sources(result, "🧪 Rick says")
         input("\n*burp* Press Enter for the next question, Morty...")
     print("\n🧪 That's how you do science, Morty! *burp* Wubba lubba dub dub!")
@@ -3,121 +3,281 @@ Kurzgesagt RAG Agent with LangChain
 Retrieves relevant information and generates comprehensive answers
 """
 
-from typing import Any, Dict, Tuple, List
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import functools
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import httpx
 from dotenv import load_dotenv
 from openai import OpenAI
 from pinecone import Pinecone
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import StructuredOutputParser, ResponseSchema
-from .context_retriever import retrieve_context, format_context
-from .language_utils import detect_language_and_translate
+from .answer_stream import AnswerStreamExtractor
+from .context_retriever import (
+    retrieve_context, format_context, get_embedding_model
+)
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache
+from .language_utils import (
+    build_detection_prompt, guess_english, parse_detection_response
+)
 from .semantic_cache import SemanticCache
 from .simple_conversation_memory import SimpleConversationMemory
+from .redis_conversation_memory import RedisConversationMemory
+from .redis_client import get_redis_client
+
+# gRPC data plane for Pinecone queries (needs pinecone[grpc] on older SDKs)
+try:
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
+
+# HTTP/2 lets concurrent OpenAI calls share one connection (needs the h2 package)
+try:
+    import h2  # noqa: F401  pylint: disable=unused-import
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Green-thread workers patch Python sockets but not gRPC's C core, where a
+# Pinecone call would block every other request in the worker
+GREEN_THREAD_WORKER_CLASSES = ("gevent", "eventlet")
+
+def create_pinecone_client():
+    """Create the Pinecone client, over gRPC unless it's unavailable or would block green threads."""
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "").lower()
+    if PineconeGRPC is None or any(name in worker_class for name in GREEN_THREAD_WORKER_CLASSES):
+        return Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    return PineconeGRPC(api_key=os.getenv("PINECONE_API_KEY"))
+
+def create_http_client() -> httpx.Client:
+    """Create the pooled HTTP client shared by the OpenAI and LangChain clients."""
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(60.0, connect=10.0)
+    )
+
+DEFAULT_CHAT_MODEL = "gpt-4"
+# Language detection and short translations don't need the answer model
+DEFAULT_UTILITY_MODEL = "gpt-4o-mini"
+# Models that accept response_format={"type": "json_schema"} (OpenAI structured outputs)
+STRUCTURED_OUTPUT_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o3", "o4")
+ANSWER_JSON_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "rag_answer",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "answer": {"type": "string"},
+                "confidence": {"type": "string", "enum": ["high", "medium", "low"]},
+                "sources_used": {"type": "integer"},
+                "language": {"type": "string"}
+            },
+            "required": ["answer", "confidence", "sources_used", "language"],
+            "additionalProperties": False
+        }
+    }
+}
+
+NO_RESULTS_MESSAGE = (
+    "I couldn't find relevant information in the Kurzgesagt transcripts to answer your question."
+)
+
+RESPONSE_SCHEMAS = [
+    ResponseSchema(
+        name="answer",
+        description="The main answer to the question in the specified language"
+    ),
+    ResponseSchema(
+        name="confidence",
+        description="Confidence level (high/medium/low) based on available context"
+    ),
+    ResponseSchema(
+        name="sources_used",
+        description="Number of sources used to generate the answer"
+    ),
+    ResponseSchema(
+        name="language",
+        description="The language of the response"
+    )
+]
+OUTPUT_PARSER = StructuredOutputParser.from_response_schemas(RESPONSE_SCHEMAS)
+# Built once at import; the prompts embed these instructions as a partial
+FORMAT_INSTRUCTIONS = OUTPUT_PARSER.get_format_instructions()
+RAG_PROMPT = PromptTemplate(
+    input_variables=["question", "context", "target_language"],
+    template=(
+        "You are a knowledgeable science communicator inspired by Kurzgesagt's style.\n"
+        "Your task is to answer questions using the provided context from Kurzgesagt videos.\n\n"
+        "Guidelines:\n"
+        "- Use ONLY the provided context to answer the question. Do not use external knowledge.\n"
+        "- If the context doesn't contain enough information, say so clearly and return 'I can't answer that based on the available context.'\n"
+        "- Always respond in the specified target language\n"
+        "- Use simple language and analogies to explain complex concepts\n"
+        "- Reference the relevant video titles explicitly in your answer\n"
+        "- Be enthusiastic about science while remaining accurate\n"
+        "- IMPORTANT: Answer in {target_language}. If the question is not in English, translate your response to match the language of the question.\n\n"
+        "Context from Kurzgesagt videos:\n{context}\n\n"
+        "Question: {question}\n\n{format_instructions}\n\n"
+        "Provide your response in the specified JSON format:"
+    ),
+    partial_variables={"format_instructions": FORMAT_INSTRUCTIONS}
+)
+RICK_PROMPT = PromptTemplate(
+    input_variables=["question", "context", "target_language"],
+    template=(
+        "Wubba lubba dub dub! You're Rick Sanchez, the smartest scientist in the universe, *burp* "
+        "and you're answering questions using context from some amateur science YouTube channel called Kurzgesagt. "
+        "Whatever, Morty.\n\n"
+        "Guidelines, Morty - pay attention because I'm only saying this once:\n"
+        "- Use ONLY the provided context to answer, *burp* - I don't need to use my infinite knowledge for this basic stuff\n"
+        "- If there's not enough info, just say \"Listen Morty, these bird animators didn't cover that topic, *burp* so I can't help you with their limited database\"\n"
+        "- Answer in {target_language} because apparently we need to be *burp* multilingual now\n"
+        "- Explain things like you're talking to Morty (aka an idiot) but with Rick's arrogance and burping\n"
+        "- Reference the video titles but mock them a little bit\n"
+        "- Be condescending about basic science concepts but still explain them correctly\n"
+        "- Add random burps, \"Morty\"s, and Rick's catchphrases\n"
+        "- Show disdain for the simplicity of the questions while still being helpful\n"
+        "- IMPORTANT: Maintain Rick's personality while being scientifically accurate, *burp*\n\n"
+        "Context from those Kurzgesagt nerds:\n{context}\n\n"
+        "Question from some dimension where people ask obvious questions: {question}\n\n"
+        "{format_instructions}\n\n"
+        "*burp* Now give me the response in that boring JSON format they want:"
+    ),
+    partial_variables={"format_instructions": FORMAT_INSTRUCTIONS}
+)
+
+class RagResult(NamedTuple):
+    """Result of a RAG query: structured answer, retrieved matches and language."""
+    answer: Dict
+    matches: List
+    language: str
+    cached: bool = False
+    # Answering failed; the answer holds the error message and is never cached
+    error: bool = False
 
 class KurzgesagtRAGAgent:
     """
     Retrieval-Augmented Generation Agent for Kurzgesagt-style Q&A.
     Handles multilingual support, semantic caching, and simple conversation memory.
     """
-    def __init__(self):
+    def __init__(self, http_client: httpx.Client = None):
         """Initialize the RAG agent and its dependencies."""
         load_dotenv()
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        self.http_client = http_client or create_http_client()
+        self.openai_client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self.http_client
+        )
+        embedding_model = get_embedding_model()
+        self.embedding_batcher = EmbeddingBatcher(
+            self.openai_client, model=embedding_model
+        )
+        redis_client = get_redis_client()
+        self.embedding_cache = EmbeddingCache(
+            maxsize=4096, redis_client=redis_client, model=embedding_model
+        )
+        # Prefer gRPC: protobuf over one multiplexed HTTP/2 connection
+        pc = create_pinecone_client()
         self.index = pc.Index("kurzgesagt-transcripts")
+        chat_model = os.getenv("OPENAI_CHAT_MODEL", DEFAULT_CHAT_MODEL)
         self.llm = ChatOpenAI(
-            model="gpt-4",
+            model=chat_model,
             temperature=0.7,
-            api_key=os.getenv("OPENAI_API_KEY")
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self.http_client
         )
-        self.response_schemas = [
-            ResponseSchema(
-                name="answer",
-                description="The main answer to the question in the specified language"
-            ),
-            ResponseSchema(
-                name="confidence",
-                description="Confidence level (high/medium/low) based on available context"
-            ),
-            ResponseSchema(
-                name="sources_used",
-                description="Number of sources used to generate the answer"
-            ),
-            ResponseSchema(
-                name="language",
-                description="The language of the response"
-            )
-        ]
-        self.output_parser = StructuredOutputParser.from_response_schemas(
-            self.response_schemas
+        self.small_llm = ChatOpenAI(
+            model=os.getenv("OPENAI_UTILITY_MODEL", DEFAULT_UTILITY_MODEL),
+            temperature=0,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self.http_client
         )
-        format_instructions = self.output_parser.get_format_instructions()
-        self.rag_prompt = PromptTemplate(
-            input_variables=["question", "context", "target_language"],
-            template=(
-                "You are a knowledgeable science communicator inspired by Kurzgesagt's style.\n"
-                "Your task is to answer questions using the provided context from Kurzgesagt videos.\n\n"
-                "Guidelines:\n"
-                "- Use ONLY the provided context to answer the question. Do not use external knowledge.\n"
-                "- If the context doesn't contain enough information, say so clearly and return 'I can't answer that based on the available context.'\n"
-                "- Always respond in the specified target language\n"
-                "- Use simple language and analogies to explain complex concepts\n"
-                "- Reference the relevant video titles explicitly in your answer\n"
-                "- Be enthusiastic about science while remaining accurate\n"
-                "- IMPORTANT: Answer in {target_language}. If the question is not in English, translate your response to match the language of the question.\n\n"
-                "Context from Kurzgesagt videos:\n{context}\n\n"
-                "Question: {question}\n\n{format_instructions}\n\n"
-                "Provide your response in the specified JSON format:"
-            ),
-            partial_variables={"format_instructions": format_instructions}
+        # Failed LLM calls raise, and lru_cache doesn't cache exceptions, so only
+        # successful detections and translations are reused
+        self._cached_detection = functools.lru_cache(maxsize=2048)(self._request_detection)
+        self._cached_translation = functools.lru_cache(maxsize=2048)(self._request_translation)
+        # Runs language detection while generate_answer probes the cache
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("RAG_AGENT_THREADS", "16")),
+            thread_name_prefix="rag-agent"
         )
-        self.rick_prompt = PromptTemplate(
-            input_variables=["question", "context", "target_language"],
-            template=(
-                "Wubba lubba dub dub! You're Rick Sanchez, the smartest scientist in the universe, *burp* "
-                "and you're answering questions using context from some amateur science YouTube channel called Kurzgesagt. "
-                "Whatever, Morty.\n\n"
-                "Guidelines, Morty - pay attention because I'm only saying this once:\n"
-                "- Use ONLY the provided context to answer, *burp* - I don't need to use my infinite knowledge for this basic stuff\n"
-                "- If there's not enough info, just say \"Listen Morty, these bird animators didn't cover that topic, *burp* so I can't help you with their limited database\"\n"
-                "- Answer in {target_language} because apparently we need to be *burp* multilingual now\n"
-                "- Explain things like you're talking to Morty (aka an idiot) but with Rick's arrogance and burping\n"
-                "- Reference the video titles but mock them a little bit\n"
-                "- Be condescending about basic science concepts but still explain them correctly\n"
-                "- Add random burps, \"Morty\"s, and Rick's catchphrases\n"
-                "- Show disdain for the simplicity of the questions while still being helpful\n"
-                "- IMPORTANT: Maintain Rick's personality while being scientifically accurate, *burp*\n\n"
-                "Context from those Kurzgesagt nerds:\n{context}\n\n"
-                "Question from some dimension where people ask obvious questions: {question}\n\n"
-                "{format_instructions}\n\n"
-                "*burp* Now give me the response in that boring JSON format they want:"
-            ),
-            partial_variables={"format_instructions": format_instructions}
+        # Cache key -> future of the answer currently being generated for it
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Where supported, have the API enforce the answer schema so the reply
+        # always parses; otherwise the prompt's format instructions still apply
+        answer_llm = self.llm
+        if chat_model.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES):
+            answer_llm = self.llm.bind(response_format=ANSWER_JSON_SCHEMA)
+        self.response_schemas = RESPONSE_SCHEMAS
+        self.output_parser = OUTPUT_PARSER
+        self.rag_prompt = RAG_PROMPT
+        self.rick_prompt = RICK_PROMPT
+        self.rag_chain = self.rag_prompt | answer_llm
+        self.rick_chain = self.rick_prompt | answer_llm
+        self.semantic_cache = SemanticCache(
+            similarity_threshold=0.90,
+            ttl_seconds=int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600")),
+            max_size=int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "1024"))
         )
-        self.rag_chain = self.rag_prompt | self.llm
-        self.rick_chain = self.rick_prompt | self.llm
-        self.semantic_cache = SemanticCache(similarity_threshold=0.90)
-        self.conversation_memory = SimpleConversationMemory(max_history=4)
+        if redis_client is not None:
+            self.conversation_memory = RedisConversationMemory(
+                redis_client, max_history=4
+            )
+        else:
+            self.conversation_memory = SimpleConversationMemory(max_history=4)
+
+    def warm_up(self) -> float:
+        """
+        Open the OpenAI and Pinecone connections before the first real question.
+        Returns the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        # Bypass the embedding cache so the OpenAI connection is really opened
+        query_embedding = self.embedding_batcher.embed("warm up")
+        self.index.query(vector=query_embedding, top_k=1)
+        return time.perf_counter() - start
 
     def _get_embedding(self, query: str):
-        """Generate embedding for a query."""
+        """Generate embedding for a query, reusing cached vectors for repeated text."""
+        embedding = self.embedding_cache.get(query)
+        if embedding is not None:
+            return embedding
         try:
-            query_response = self.openai_client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=[query]
-            )
-            return query_response.data[0].embedding
+            embedding = self.embedding_batcher.embed(query)
         except Exception:  # pylint: disable=broad-except
             return None
+        self.embedding_cache.add(query, embedding)
+        return embedding
 
-    def _get_from_cache(self, query: str):
+    def _get_embeddings(self, queries: List[str]) -> List[Any]:
+        """Embed several queries, sending only the uncached ones in one batch."""
+        embeddings = [self.embedding_cache.get(query) for query in queries]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+        try:
+            fresh = self.embedding_batcher.embed_many([queries[i] for i in missing])
+        except Exception:  # pylint: disable=broad-except
+            return embeddings
+        for i, embedding in zip(missing, fresh):
+            embeddings[i] = embedding
+            self.embedding_cache.add(queries[i], embedding)
+        return embeddings
+
+    def _get_from_cache(self, query: str, query_embedding=None):
         """Retrieve from semantic cache with similarity matching."""
         exact_match = self.semantic_cache.get_exact(query)
         if exact_match:
             return exact_match['results']
-        query_embedding = self._get_embedding(query)
         if query_embedding:
             similar_match = self.semantic_cache.find_similar(query_embedding)
             if similar_match:
@@ -125,25 +285,134 @@ class KurzgesagtRAGAgent:
                 return results
         return None
 
-    def _add_to_cache(self, query: str, results: Any):
+    def _add_to_cache(self, query: str, results: Any, query_embedding=None):
         """Add to semantic cache with embedding."""
-        query_embedding = self._get_embedding(query)
+        if query_embedding is None:
+            query_embedding = self._get_embedding(query)
         if query_embedding:
             self.semantic_cache.add(query, query_embedding, results)
 
     def retrieve_context(self, query: str, top_k: int = 3):
         """Retrieve relevant context from Pinecone index."""
-        return retrieve_context(self.index, query, self.openai_client, top_k=top_k)
+        query_embedding = self._get_embedding(query)
+        if query_embedding is None:
+            return []
+        return retrieve_context(
+            self.index, query, self.openai_client,
+            top_k=top_k, query_embedding=query_embedding
+        )
 
     def format_context(self, matches: List[Any]):
         """Format context matches for prompt input."""
         return format_context(matches)
 
+    def _stream_chain(
+        self, chain: Any, inputs: Dict, on_token: Callable[[str], None]
+    ) -> str:
+        """Stream the LLM response, passing answer text to on_token as it arrives."""
+        extractor = AnswerStreamExtractor()
+        parts = []
+        for chunk in chain.stream(inputs):
+            text = getattr(chunk, "content", chunk)
+            parts.append(text)
+            answer_text = extractor.feed(text)
+            if answer_text:
+                on_token(answer_text)
+        return "".join(parts)
+
+    def _build_inputs(
+        self, question: str, matches: List[Any], detected_language: str,
+        conversation_context: str, mode: str
+    ):
+        """Pick the chain for the mode and build its prompt inputs."""
+        context = self.format_context(matches)
+        if conversation_context:
+            context = (
+                f"Recent conversation:\n{conversation_context}\n\nRelevant information:\n{context}"
+            )
+        chain = self.rick_chain if mode == "crazy_scientist" else self.rag_chain
+        inputs = {
+            "question": question,
+            "context": context,
+            "target_language": detected_language
+        }
+        return chain, inputs
+
+    def _no_results_result(
+        self, message: str, detected_language: str, is_follow_up: bool
+    ) -> RagResult:
+        """Build the result returned when retrieval finds nothing relevant."""
+        structured_answer = {
+            'answer': message,
+            'confidence': 'low',
+            'sources_used': 0,
+            'language': detected_language,
+            'sources': [],
+            'raw_response': message,
+            'is_follow_up': is_follow_up
+        }
+        return RagResult(structured_answer, [], detected_language)
+
+    def _parse_result(
+        self, raw_response: Any, matches: List[Any], detected_language: str,
+        is_follow_up: bool
+    ) -> RagResult:
+        """Parse the LLM's JSON reply, falling back to the raw text if it is malformed."""
+        if hasattr(raw_response, "content"):
+            raw_response = raw_response.content
+        sources = [
+            match.metadata.get('video_title', 'Unknown')
+            for match in matches
+        ]
+        try:
+            parsed_response = self.output_parser.parse(raw_response)
+        except ValueError:
+            parsed_response = {}
+        structured_answer = {
+            'answer': parsed_response.get('answer', raw_response),
+            'confidence': parsed_response.get('confidence', 'medium'),
+            'sources_used': parsed_response.get('sources_used', len(matches)),
+            'language': parsed_response.get('language', detected_language),
+            'sources': sources,
+            'raw_response': raw_response,
+            'is_follow_up': is_follow_up
+        }
+        return RagResult(structured_answer, matches, detected_language)
+
+    def _error_result(self, error: Exception, is_follow_up: bool) -> RagResult:
+        """Build the result returned when answering fails."""
+        error_msg = f"Error generating answer: {str(error)}"
+        structured_error = {
+            'answer': error_msg,
+            'confidence': 'low',
+            'sources_used': 0,
+            'language': 'English',
+            'sources': [],
+            'raw_response': error_msg,
+            'is_follow_up': is_follow_up
+        }
+        return RagResult(structured_error, [], "English", error=True)
+
+    def _record(
+        self, question: str, session_id: str, result: RagResult,
+        cache_key: Optional[str], cache_embedding=None
+    ) -> RagResult:
+        """Remember the answer in the conversation and, if cacheable, in the semantic cache."""
+        # A transient OpenAI or Pinecone failure must not be served from the cache
+        if cache_key is not None and not result.error:
+            self._add_to_cache(cache_key, result, cache_embedding)
+        self.conversation_memory.add_qa_pair(
+            question, result.answer['answer'], session_id
+        )
+        return result
+
     def generate_answer(
-        self, question: str, session_id: str = "default", mode: str = "normal"
-    ) -> Tuple[Dict, List, str]:
+        self, question: str, session_id: str = "default", mode: str = "normal",
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> RagResult:
         """
         Generate answer using RAG with multilingual support, semantic caching, and simple conversation memory.
+        If on_token is given, answer text is streamed to it while the LLM responds.
         """
         is_follow_up = self.conversation_memory.is_likely_followup(question)
         conversation_context = ""
@@ -151,116 +420,99 @@ class KurzgesagtRAGAgent:
             conversation_context = self.conversation_memory.get_recent_context(
                 session_id, max_pairs=3
             )
-        cache_key = f"{question}||MODE:{mode}"
-        cached_result = self._get_from_cache(cache_key)
-        if cached_result:
-            answer_data, matches, _ = cached_result
-            clean_answer = (
-                answer_data.get('answer', str(answer_data))
-                if isinstance(answer_data, dict) else str(answer_data)
+        # Follow-ups depend on the conversation so far and bypass the cache.
+        cache_key = None if is_follow_up else f"{question}||MODE:{mode}"
+        cache_embedding = None
+        # Detect the language while the question is embedded (and the cache probed);
+        # a cache hit cancels it if it has not started yet
+        detection = self.executor.submit(self.detect_language, question)
+        if cache_key is not None:
+            # Embed the question alongside the cache key: for English input it is
+            # also the retrieval query, so a cache miss needs no second round trip
+            cache_embedding, _ = self._get_embeddings([cache_key, question])
+            cached_result = self._get_from_cache(cache_key, cache_embedding)
+            if cached_result:
+                detection.cancel()
+                self.conversation_memory.add_qa_pair(
+                    question, cached_result.answer['answer'], session_id
+                )
+                return cached_result._replace(cached=True)
+            return self._answer_once(
+                question, session_id, detection, conversation_context, mode,
+                on_token, cache_key, cache_embedding
+            )
+        # Embed the question while detection runs: English questions are also
+        # the retrieval query, which then comes straight from the embedding cache
+        self._get_embedding(question)
+        result = self._answer(
+            question, detection, is_follow_up, conversation_context, mode, on_token
+        )
+        return self._record(question, session_id, result, None)
+
+    def _answer_once(
+        self, question: str, session_id: str, detection: Future,
+        conversation_context: str, mode: str,
+        on_token: Optional[Callable[[str], None]], cache_key: str, cache_embedding
+    ) -> RagResult:
+        """Answer a cache miss, or wait for the answer already being generated for cache_key."""
+        with self._inflight_lock:
+            inflight = self._inflight.get(cache_key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = self._inflight[cache_key] = Future()
+        if not is_leader:
+            detection.cancel()
+            result = inflight.result()
+            self.conversation_memory.add_qa_pair(
+                question, result.answer['answer'], session_id
             )
-            self.conversation_memory.add_qa_pair(question, clean_answer, session_id)
-            return cached_result
+            return result if result.error else result._replace(cached=True)
         try:
-            detected_language, english_question = detect_language_and_translate(
-                self.llm, question
+            result = self._answer(
+                question, detection, False, conversation_context, mode, on_token
             )
+            inflight.set_result(result)
+            return self._record(question, session_id, result, cache_key, cache_embedding)
+        except BaseException as e:
+            if not inflight.done():
+                inflight.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+
+    def _answer(
+        self, question: str, detection: Future, is_follow_up: bool,
+        conversation_context: str, mode: str,
+        on_token: Optional[Callable[[str], None]]
+    ) -> RagResult:
+        """Retrieve context and answer a question that missed the cache (nothing is recorded)."""
+        try:
+            detected_language, english_question = detection.result()
             matches = self.retrieve_context(english_question, top_k=3)
             if not matches:
-                no_results_msg = (
-                    "I couldn't find relevant information in the Kurzgesagt transcripts to answer your question."
+                no_results_msg = self.translate_to_target_language(
+                    NO_RESULTS_MESSAGE, detected_language
                 )
-                if detected_language.lower() != "english":
-                    no_results_msg = self.translate_to_target_language(
-                        no_results_msg, detected_language
-                    )
-                structured_answer = {
-                    'answer': no_results_msg,
-                    'confidence': 'low',
-                    'sources_used': 0,
-                    'language': detected_language,
-                    'sources': [],
-                    'raw_response': no_results_msg,
-                    'is_follow_up': is_follow_up
-                }
-                result = (structured_answer, [], detected_language)
-                self.conversation_memory.add_qa_pair(
-                    question, no_results_msg, session_id
+                return self._no_results_result(
+                    no_results_msg, detected_language, is_follow_up
                 )
-                self._add_to_cache(cache_key, result)
-                return result
-            context = self.format_context(matches)
-            sources = [
-                match.metadata.get('video_title', 'Unknown')
-                for match in matches
-            ]
-            if is_follow_up and conversation_context:
-                context = (
-                    f"Recent conversation:\n{conversation_context}\n\nRelevant information:\n{context}"
-                )
-            chain = self.rick_chain if mode == "crazy_scientist" else self.rag_chain
-            raw_response = chain.invoke({
-                "question": question,
-                "context": context,
-                "target_language": detected_language
-            })
-            if hasattr(raw_response, "content"):
-                raw_response = raw_response.content
-            try:
-                parsed_response = self.output_parser.parse(raw_response)
-                structured_answer = {
-                    'answer': parsed_response.get('answer', raw_response),
-                    'confidence': parsed_response.get('confidence', 'medium'),
-                    'sources_used': parsed_response.get('sources_used', len(matches)),
-                    'language': parsed_response.get('language', detected_language),
-                    'sources': sources,
-                    'raw_response': raw_response,
-                    'is_follow_up': is_follow_up
-                }
-                result = (structured_answer, matches, detected_language)
-                self._add_to_cache(cache_key, result)
-                clean_answer = structured_answer.get('answer', raw_response)
-                self.conversation_memory.add_qa_pair(
-                    question, clean_answer, session_id
-                )
-                return result
-            except ValueError:
-                structured_answer = {
-                    'answer': raw_response,
-                    'confidence': 'medium',
-                    'sources_used': len(matches),
-                    'language': detected_language,
-                    'sources': sources,
-                    'raw_response': raw_response,
-                    'is_follow_up': is_follow_up
-                }
-                result = (structured_answer, matches, detected_language)
-                self._add_to_cache(cache_key, result)
-                self.conversation_memory.add_qa_pair(
-                    question, raw_response, session_id
-                )
-                return result
-        except Exception as e:  # pylint: disable=broad-except
-            error_msg = f"Error generating answer: {str(e)}"
-            structured_error = {
-                'answer': error_msg,
-                'confidence': 'low',
-                'sources_used': 0,
-                'language': 'English',
-                'sources': [],
-                'raw_response': error_msg,
-                'is_follow_up': is_follow_up
-            }
-            result = (structured_error, [], "English")
-            self.conversation_memory.add_qa_pair(
-                question, error_msg, session_id
+            chain, inputs = self._build_inputs(
+                question, matches, detected_language, conversation_context, mode
+            )
+            if on_token is None:
+                raw_response = chain.invoke(inputs)
+            else:
+                raw_response = self._stream_chain(chain, inputs, on_token)
+            return self._parse_result(
+                raw_response, matches, detected_language, is_follow_up
             )
-            self._add_to_cache(cache_key, result)
-            return result
+        except Exception as e:  # pylint: disable=broad-except
+            return self._error_result(e, is_follow_up)
 
     def get_conversation_context(self, session_id: str = "default") -> Dict:
         """Get current conversation context for a session."""
-        history = self.conversation_memory.sessions.get(session_id, [])
+        history = self.conversation_memory.get_history(session_id)
         if not history:
             return {"qa_pairs": [], "count": 0}
         return {
@@ -283,16 +535,36 @@ class KurzgesagtRAGAgent:
         """Get conversation memory statistics."""
         return self.conversation_memory.get_stats()
 
+    def _request_detection(self, question: str):
+        """Ask the small LLM for the question's language and English translation."""
+        response = self.small_llm.invoke(build_detection_prompt(question))
+        return parse_detection_response(response.content, question)
+
+    def detect_language(self, question: str):
+        """Detect the question's language and translate it to English, reusing earlier answers."""
+        guess = guess_english(question)
+        if guess is not None:
+            return guess
+        try:
+            return self._cached_detection(question)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"❌ Language detection/translation error: {e}")
+            return "unknown", question
+
+    def _request_translation(self, text: str, target_language: str) -> str:
+        """Ask the small LLM to translate text."""
+        translation_prompt = (
+            f"Translate the following text to {target_language}. Keep the meaning and tone exactly the same:\n\n{text}"
+        )
+        response = self.small_llm.invoke(translation_prompt)
+        return response.content if hasattr(response, 'content') else str(response)
+
     def translate_to_target_language(self, text: str, target_language: str) -> str:
         """Translate text to target language using LLM."""
         if target_language.lower() == 'english':
             return text
         try:
-            translation_prompt = (
-                f"Translate the following text to {target_language}. Keep the meaning and tone exactly the same:\n\n{text}"
-            )
-            response = self.llm.invoke(translation_prompt)
-            return response.content if hasattr(response, 'content') else str(response)
+            return self._cached_translation(text, target_language)
         except Exception:  # pylint: disable=broad-except
             return text
 
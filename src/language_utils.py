@@ -1,13 +1,40 @@
 """
 Language Utilities Module
-Handles language detection and translation for the Kurzgesagt RAG Agent.
+Language detection helpers for the Kurzgesagt RAG Agent: a quick English
+heuristic plus the LLM prompt and reply parsing used by its cached detector.
 """
 
-def detect_language_and_translate(llm, text):
-    """Detect the language of the input text and translate it to English."""
-    try:
-        # Detect language using LangChain's ChatOpenAI client
-        detection_prompt = f"""
+import re
+
+WORD_RE = re.compile(r"[a-z']+")
+# English words with no lookalike in Dutch, German or the Romance languages
+# ("is" is also Dutch and Afrikaans, so it and the other linking words are left out)
+ENGLISH_MARKERS = frozenset({
+    "the", "what", "does", "which", "where", "how", "why", "when", "who",
+    "this", "that", "with", "about", "would", "could", "there", "happens"
+})
+ENGLISH_MIN_MARKERS = 2
+# Common Dutch/Afrikaans, German, French and Spanish words that rule English out
+NON_ENGLISH_MARKERS = frozenset({
+    "wat", "het", "een", "de", "ist", "der", "das", "und", "est", "les", "que", "el"
+})
+
+
+def guess_english(text):
+    """Return ("English", text) for ASCII text with two or more English-only words, else None."""
+    if not text.isascii():
+        return None
+    words = WORD_RE.findall(text.lower())
+    if not NON_ENGLISH_MARKERS.isdisjoint(words):
+        return None
+    if sum(word in ENGLISH_MARKERS for word in words) < ENGLISH_MIN_MARKERS:
+        return None
+    return "English", text
+
+
+def build_detection_prompt(text):
+    """Build the prompt asking the LLM for the language and an English translation."""
+    return f"""
         Analyze this text and determine:
         1. What language is it in? (respond with language name in English)
         2. If it's not in English, provide an English translation
@@ -20,22 +47,17 @@ def detect_language_and_translate(llm, text):
         Translation: [English version of the text]
         """
 
-        response = llm.invoke(detection_prompt)
-        response_text = response.content
 
-        # Parse the response
-        lines = response_text.strip().split('\n')
-        language = "English"
-        english_text = text
+def parse_detection_response(response_text, text):
+    """Parse the LLM's Language:/Translation: reply, defaulting to English and the original text."""
+    lines = response_text.strip().split('\n')
+    language = "English"
+    english_text = text
 
-        for line in lines:
-            if line.startswith("Language:"):
-                language = line.replace("Language:", "").strip()
-            elif line.startswith("Translation:"):
-                english_text = line.replace("Translation:", "").strip()
+    for line in lines:
+        if line.startswith("Language:"):
+            language = line.replace("Language:", "").strip()
+        elif line.startswith("Translation:"):
+            english_text = line.replace("Translation:", "").strip()
 
-        return language, english_text
-
-    except Exception as e:
-        print(f"❌ Language detection/translation error: {e}")
-        return "unknown", text
+    return language, english_text
@@ -58,7 +58,8 @@ def create_embeddings_and_upload() -> object:
     index = pc.Index(index_name)
     print("\n🧠 Generating embeddings and uploading...")
     batch_size = 20
-    embedding_model = "text-embedding-ada-002"
+    # Queries must be embedded with the same model (see OPENAI_EMBEDDING_MODEL)
+    embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
     total_batches = (len(data) + batch_size - 1) // batch_size
     successful_uploads = 0
     for i in range(0, len(data), batch_size):
@@ -125,7 +126,7 @@ def test_semantic_search(index=None) -> None:
         print(f"\n🔎 Query: '{query}'")
         try:
             query_response = openai_client.embeddings.create(
-                model="text-embedding-ada-002",
+                model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002"),
                 input=[query]
             )
             query_embedding = query_response.data[0].embedding
@@ -0,0 +1,19 @@
+"""
+Redis Client Module
+Optional shared Redis connection for state that should outlive a single worker.
+"""
+
+import os
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+def get_redis_client():
+    """Return a Redis client when REDIS_URL is set and redis is installed, else None."""
+    redis_url = os.getenv("REDIS_URL")
+    if redis is None or not redis_url:
+        return None
+    return redis.Redis.from_url(redis_url)
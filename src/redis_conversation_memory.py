@@ -0,0 +1,71 @@
+"""
+Redis Conversation Memory
+Drop-in replacement for SimpleConversationMemory that keeps session history
+in Redis, so every worker process sees the same conversation.
+"""
+
+import json
+from datetime import datetime
+from .simple_conversation_memory import SimpleConversationMemory
+
+
+class RedisConversationMemory(SimpleConversationMemory):
+    """Conversation memory stored as one capped Redis list per session."""
+
+    def __init__(self, redis_client, max_history: int = 4, ttl_seconds: int = 3600):
+        """Initialize with a Redis client, history size and idle expiry."""
+        super().__init__(max_history=max_history)
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        """Build the Redis key for a session's history."""
+        return f"conv:{session_id}"
+
+    def add_qa_pair(
+        self, question: str, answer: str, session_id: str = "default"
+    ) -> None:
+        """Append a Q&A pair, trim to max_history and refresh the expiry."""
+        turn = {
+            "q": question,
+            "a": answer[:300] + "..." if len(answer) > 300 else answer,
+            "time": datetime.now().isoformat(),
+        }
+        key = self._key(session_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.rpush(key, json.dumps(turn))
+        pipe.ltrim(key, -self.max_history, -1)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    @staticmethod
+    def _decode_turns(raw_turns) -> list:
+        """Decode stored JSON turns back into Q&A dicts."""
+        history = []
+        for raw in raw_turns:
+            qa = json.loads(raw)
+            qa["time"] = datetime.fromisoformat(qa["time"])
+            history.append(qa)
+        return history
+
+    def get_history(self, session_id: str = "default") -> list:
+        """Get the stored Q&A pairs for a session, oldest first."""
+        return self._decode_turns(self.redis.lrange(self._key(session_id), 0, -1))
+
+    def get_recent_history(self, session_id: str = "default", max_pairs: int = 2) -> list:
+        """Fetch only the last max_pairs Q&A pairs from Redis."""
+        start = -max_pairs if max_pairs > 0 else 0
+        return self._decode_turns(self.redis.lrange(self._key(session_id), start, -1))
+
+    def clear_session(self, session_id: str = "default") -> None:
+        """Clear conversation history for a session."""
+        self.redis.delete(self._key(session_id))
+
+    def get_stats(self) -> dict:
+        """Get simple statistics (session counts would need a key scan, so they are omitted)."""
+        return {
+            "backend": "redis",
+            "max_history_per_session": self.max_history,
+            "session_ttl_seconds": self.ttl_seconds,
+        }
@@ -5,74 +5,165 @@ Provides a cache for query results with semantic similarity matching.
 """
 
 import re
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
 
 
-def cosine_similarity_manual(vec1, vec2):
-    """Calculate cosine similarity between two vectors manually."""
-    a = np.array(vec1)
-    b = np.array(vec2)
-    dot_product = np.dot(a, b)
-    magnitude_a = np.linalg.norm(a)
-    magnitude_b = np.linalg.norm(b)
-    if magnitude_a == 0 or magnitude_b == 0:
-        return 0.0
-    return dot_product / (magnitude_a * magnitude_b)
+WHITESPACE_RE = re.compile(r"\s+")
 
 
 def normalize_query(query):
     """Normalize query text for better matching."""
-    return re.sub(r"\s+", " ", query.lower()).strip()
+    return WHITESPACE_RE.sub(" ", query.lower()).strip()
+
+
+def normalize_embedding(embedding):
+    """Return the embedding as a float32 unit vector, or None if it has zero length."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return None
+    return vector / norm
 
 
 class SemanticCache:
     """
     Enhanced cache with semantic similarity matching.
     Stores queries, their embeddings, and results for fast retrieval.
+    Bounded to max_size entries, evicting the least recently used query.
+    Embeddings live in one stacked matrix of unit vectors (a row per query),
+    so a lookup scores every entry with a single dot product per row.
+    Expired rows are masked out of lookups and purged once they pile up.
     """
 
-    def __init__(self, similarity_threshold=0.9):
-        self._cache = {}
+    def __init__(self, similarity_threshold=0.9, ttl_seconds=None, max_size=1024):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
         self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._matrix = None
+        self._expires = None
+        self._row_queries = []
+        self._free_rows = []
+
+    def _is_expired(self, cached_data):
+        """Check whether a cache entry has outlived its TTL."""
+        expires_at = cached_data.get("expires_at")
+        return expires_at is not None and time.monotonic() >= expires_at
 
-    def _calculate_similarity(self, embedding1, embedding2):
-        """Calculate similarity between embeddings."""
-        return cosine_similarity_manual(embedding1, embedding2)
+    def _purge_expired(self):
+        """Drop all expired entries from the cache (caller holds the lock)."""
+        expired = [
+            query for query, data in self._cache.items() if self._is_expired(data)
+        ]
+        for query in expired:
+            self._remove(query)
+
+    def _store_row(self, query, vector, expires_at):
+        """Write a unit vector into a free matrix row and return the row (caller holds the lock)."""
+        if self._matrix is None:
+            self._matrix = np.zeros((min(64, self.max_size), vector.shape[0]), dtype=np.float32)
+            # Per-row expiry time: inf never expires, -inf marks a free row
+            self._expires = np.full(self._matrix.shape[0], -np.inf)
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._row_queries[row] = query
+        else:
+            row = len(self._row_queries)
+            if row == self._matrix.shape[0]:
+                # Grow geometrically so inserts stay amortized O(1)
+                capacity = max(row * 2, 1)
+                self._matrix = np.resize(self._matrix, (capacity, self._matrix.shape[1]))
+                self._matrix[row:] = 0.0
+                self._expires = np.resize(self._expires, capacity)
+                self._expires[row:] = -np.inf
+            self._row_queries.append(query)
+        self._matrix[row] = vector
+        self._expires[row] = np.inf if expires_at is None else expires_at
+        return row
+
+    def _remove(self, query):
+        """Delete an entry and free its matrix row (caller holds the lock)."""
+        cached_data = self._cache.pop(query)
+        row = cached_data.get("row")
+        if row is not None:
+            self._matrix[row] = 0.0
+            self._expires[row] = -np.inf
+            self._row_queries[row] = None
+            self._free_rows.append(row)
 
     def find_similar(self, query_embedding):
         """
         Find the most similar cached query above the similarity threshold.
         Returns (cached_query, results, similarity) or None if not found.
         """
-        best_match = None
-        best_similarity = 0.0
-        for cached_query, cached_data in self._cache.items():
-            embedding = cached_data.get("embedding")
-            if embedding is not None:
-                similarity = self._calculate_similarity(query_embedding, embedding)
-                if (
-                    similarity > best_similarity
-                    and similarity >= self.similarity_threshold
-                ):
-                    best_similarity = similarity
-                    best_match = (cached_query, cached_data["results"], similarity)
-        return best_match
+        with self._lock:
+            rows = len(self._row_queries)
+            if rows == 0 or len(self._free_rows) == rows:
+                return None
+            query_vector = normalize_embedding(query_embedding)
+            if query_vector is None:
+                return None
+            expired = self._expires[:rows] <= time.monotonic()
+            # Free rows count as expired too; compact once real expiries pass a quarter
+            if int(expired.sum()) - len(self._free_rows) > rows // 4:
+                self._purge_expired()
+            # Rows are unit vectors, so cosine similarity is a plain dot product
+            similarities = self._matrix[:rows] @ query_vector
+            similarities[expired] = -np.inf
+            best_row = int(similarities.argmax())
+            best_similarity = float(similarities[best_row])
+            cached_query = self._row_queries[best_row]
+            if cached_query is None or best_similarity < self.similarity_threshold:
+                return None
+            self._cache.move_to_end(cached_query)
+            return (cached_query, self._cache[cached_query]["results"], best_similarity)
 
     def add(self, query, embedding, results):
         """Add a query, its embedding, and results to the cache."""
-        self._cache[query] = {
-            "embedding": embedding,
-            "results": results,
-            "normalized_query": normalize_query(query),
-        }
+        with self._lock:
+            if query in self._cache:
+                self._remove(query)
+            vector = normalize_embedding(embedding) if embedding is not None else None
+            expires_at = (
+                time.monotonic() + self.ttl_seconds
+                if self.ttl_seconds is not None else None
+            )
+            self._cache[query] = {
+                "row": (
+                    self._store_row(query, vector, expires_at)
+                    if vector is not None else None
+                ),
+                "results": results,
+                "normalized_query": normalize_query(query),
+                "expires_at": expires_at,
+            }
+            while len(self._cache) > self.max_size:
+                self._remove(next(iter(self._cache)))
 
     def get_exact(self, query):
         """Get exact match from cache by query string."""
-        return self._cache.get(query)
+        with self._lock:
+            cached_data = self._cache.get(query)
+            if cached_data is None:
+                return None
+            if self._is_expired(cached_data):
+                self._remove(query)
+                return None
+            self._cache.move_to_end(query)
+            return cached_data
 
     def clear(self):
         """Clear the cache."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._matrix = None
+            self._expires = None
+            self._row_queries = []
+            self._free_rows = []
 
     def size(self):
         """Get the number of cached queries."""
@@ -82,5 +173,7 @@ class SemanticCache:
         """Get cache statistics as a dictionary."""
         return {
             "total_queries": len(self._cache),
+            "max_size": self.max_size,
             "threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
         }
@@ -31,14 +31,21 @@ class SimpleConversationMemory:
         if len(self.sessions[session_id]) > self.max_history:
             self.sessions[session_id] = self.sessions[session_id][-self.max_history:]
 
+    def get_history(self, session_id: str = "default") -> list:
+        """Get the stored Q&A pairs for a session, oldest first."""
+        return self.sessions.get(session_id, [])
+
+    def get_recent_history(self, session_id: str = "default", max_pairs: int = 2) -> list:
+        """Get the last max_pairs Q&A pairs for a session, oldest first."""
+        return self.get_history(session_id)[-max_pairs:]
+
     def get_recent_context(
         self, session_id: str = "default", max_pairs: int = 2
     ) -> str:
         """Get recent Q&A context as formatted string for the LLM."""
-        history = self.sessions.get(session_id, [])
-        if not history:
+        recent = self.get_recent_history(session_id, max_pairs)
+        if not recent:
             return ""
-        recent = history[-max_pairs:]
         context_parts = []
         for i, qa in enumerate(recent, 1):
             context_parts.append(f"Recent Q{i}: {qa['q']}")
@@ -0,0 +1,109 @@
+"""
+TTS Cache Module
+Content-addressed, byte-budgeted LRU cache for synthesized speech audio,
+optionally backed by Redis so that all workers share clips.
+Avoids re-synthesizing identical text with the same voice and model.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def make_tts_key(text, voice_id, model, output_format, voice_settings=None):
+    """Build a content-addressed cache key from the text and synthesis settings."""
+    settings = sorted(voice_settings.items()) if voice_settings else ""
+    material = f"{voice_id}|{model}|{output_format}|{settings}|{text}"
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TTSCache:
+    """
+    LRU cache for audio bytes bounded by total size rather than entry count.
+    Audio clips are large, so the budget is expressed in bytes.
+    Redis errors are treated as misses so synthesis remains the fallback.
+    """
+
+    def __init__(self, max_bytes=100 * 1024 * 1024, redis_client=None,
+                 redis_ttl_seconds=7 * 86400):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.redis_client = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return cached audio bytes for key (marking it recently used) or None."""
+        with self._lock:
+            audio_bytes = self._cache.get(key)
+            if audio_bytes is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return audio_bytes
+        audio_bytes = self._get_from_redis(key)
+        with self._lock:
+            if audio_bytes is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._store_local(key, audio_bytes)
+        return audio_bytes
+
+    def add(self, key, audio_bytes):
+        """Store audio bytes locally and, if configured, in Redis."""
+        self._store_local(key, audio_bytes)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.setex(
+                    "tts:" + key, self.redis_ttl_seconds, audio_bytes
+                )
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    def _get_from_redis(self, key):
+        """Fetch audio bytes from Redis."""
+        if self.redis_client is None:
+            return None
+        try:
+            return self.redis_client.get("tts:" + key)
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def _store_local(self, key, audio_bytes):
+        """Insert into the in-process LRU, evicting least recently used entries over budget."""
+        size = len(audio_bytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._cache[key] = audio_bytes
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+            self.current_bytes = 0
+
+    def size(self):
+        """Get the number of cached clips."""
+        return len(self._cache)
+
+    def get_stats(self):
+        """Get cache statistics as a dictionary."""
+        return {
+            "total_clips": len(self._cache),
+            "total_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_enabled": self.redis_client is not None,
+        }
@@ -675,7 +675,11 @@ class ChatBot {
                     // Get optimized speech parameters from server
                     const response = await fetch('/voice/speak', {
                         method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
+                        headers: {
+                            'Content-Type': 'application/json',
+                            // Prefer raw MP3 bytes; browser TTS fallback still answers with JSON
+                            'Accept': 'audio/mpeg, application/json;q=0.9'
+                        },
                         body: JSON.stringify({
                             text: text,
                             language: language,
@@ -683,16 +687,20 @@ class ChatBot {
                         })
                     });
                     
-                    const ttsData = await response.json();
+                    const contentType = response.headers.get('Content-Type') || '';
+                    const isAudio = response.ok && contentType.startsWith('audio/');
+                    const ttsData = isAudio ? {} : await response.json();
                     
                     // Check if we got ElevenLabs audio
-                    if (ttsData.provider && ttsData.provider.startsWith('elevenlabs') && ttsData.audio_base64) {
+                    if (isAudio || (ttsData.provider && ttsData.provider.startsWith('elevenlabs') && ttsData.audio_base64)) {
                         // Update button to show ElevenLabs is being used
                         ttsButton.title = 'High-quality ElevenLabs voice synthesis';
                         console.log('🎵 Using ElevenLabs TTS audio');
                         
                         // Use ElevenLabs audio
-                        const audioBlob = this.base64ToBlob(ttsData.audio_base64, 'audio/mpeg');
+                        const audioBlob = isAudio
+                            ? await response.blob()
+                            : this.base64ToBlob(ttsData.audio_base64, 'audio/mpeg');
                         const audioUrl = URL.createObjectURL(audioBlob);
                         const audioElement = new Audio(audioUrl);
                         